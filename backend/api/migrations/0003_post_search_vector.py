@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:38
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_post_feed_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('content', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='post_search_idx'),
+        ),
+        # auth_user belongs to django.contrib.auth, so its names are indexed by expression rather than
+        # a generated column. The expression must match USER_SEARCH_VECTOR_SQL in database/postgres.py.
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX user_search_idx ON auth_user USING GIN (
+                    to_tsvector('simple'::regconfig,
+                                coalesce(username, '') || ' ' || coalesce(first_name, '') || ' ' || coalesce(last_name, ''))
+                )
+            """,
+            reverse_sql="DROP INDEX IF EXISTS user_search_idx",
+        ),
+    ]
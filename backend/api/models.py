@@ -7,6 +7,8 @@ from django.db import models
 # Create your models here.
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 
 # Each class is a table - each attribute is a column
 
@@ -14,3 +16,16 @@ class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Maintained by PostgreSQL on every write, so search never tokenizes rows at query time
+    search_vector = models.GeneratedField(
+        expression=SearchVector('content', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of an author's feed on (created_at, id)
+            models.Index(fields=['author', '-created_at', '-id'], name='post_author_feed_idx'),
+            GinIndex(fields=['search_vector'], name='post_search_idx'),
+        ]
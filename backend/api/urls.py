@@ -2,6 +2,7 @@
 Mapping URLs to backend functions
 '''
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -62,6 +63,7 @@ urlpatterns = [
 
     # Events
     path('events/', views.create_event),
+    path('events/upcoming/', views.get_upcoming_events),
     path('events/<int:event_id>/', views.get_event),
     path('events/<int:event_id>/delete/', views.delete_event),
     path('events/<int:event_id>/update/', views.update_event),
@@ -71,6 +73,7 @@ urlpatterns = [
     path('events/<int:event_id>/going/<int:user_id>/remove/', views.remove_going_event),
     path('events/<int:event_id>/interested/<int:user_id>/', views.interested_event),
     path('events/<int:event_id>/interested/<int:user_id>/remove/', views.remove_interested_event),
+    path('events/<int:event_id>/attendees/', views.get_event_attendees),
 
     # Post/Event Comments
     path('comments/', views.create_comment),
@@ -105,6 +108,7 @@ urlpatterns = [
     # Search
     path('search/', views.search),
     path('search/organizations/', views.search_organizations),
+    path('search/organizations/typeahead/', views.typeahead_organizations),
     path('search/events/', views.search_events),
 
     # Feedback
@@ -114,3 +118,7 @@ urlpatterns = [
     path('presigned-url/', views.generate_presigned_url),
     path('test-boto3/', views.test_boto3_connection),
 ]
+
+if settings.DEBUG:
+    # Lets the API tests wait for background search indexing instead of polling
+    urlpatterns.append(path('search/flush/', views.flush_search_index))
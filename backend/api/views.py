@@ -190,7 +190,10 @@ def get_organization_children(request: HttpRequest, org_id: int) -> JsonResponse
 
 def get_organization_posts(request: HttpRequest, org_id: int) -> JsonResponse:
     if request.method == "GET":
-        result = db.get_organization_posts(org_id)
+        include_descendants = request.GET.get("include_descendants", "false").lower() == "true"
+        limit = int(request.GET.get("limit", 10))
+        cursor = request.GET.get("cursor")
+        result = db.get_organization_posts(org_id, include_descendants, limit, cursor)
         return JsonResponse(result, status=get_status_code(result))
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
@@ -375,6 +378,18 @@ def get_event(request: HttpRequest, event_id: int) -> JsonResponse:
         return JsonResponse(result, status=get_status_code(result))
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
+def get_upcoming_events(request: HttpRequest) -> JsonResponse:
+    if request.method == "GET":
+        org_id = request.GET.get("org_id")
+        result = db.get_upcoming_events(
+            request.GET.get("start"),
+            request.GET.get("end"),
+            int(org_id) if org_id else None,
+            int(request.GET.get("limit", 50))
+        )
+        return JsonResponse(result, status=get_status_code(result))
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
 # Events Going/Interested
 def going_event(request: HttpRequest, event_id: int, user_id: int) -> JsonResponse:
     if request.method == "POST":
@@ -400,6 +415,15 @@ def remove_interested_event(request: HttpRequest, event_id: int, user_id: int) -
         return JsonResponse(result, status=get_status_code(result))
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
+def get_event_attendees(request: HttpRequest, event_id: int) -> JsonResponse:
+    if request.method == "GET":
+        status = request.GET.get("status", "going")
+        offset = int(request.GET.get("offset", 0))
+        limit = int(request.GET.get("limit", 50))
+        result = db.get_event_attendees(event_id, status, offset, limit)
+        return JsonResponse(result, status=get_status_code(result))
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
 # Post/Event Comments
 def create_comment(request: HttpRequest) -> JsonResponse:
     if request.method == "POST":
@@ -510,7 +534,9 @@ def get_user_feed(request: HttpRequest, user_id: int) -> JsonResponse:
     if request.method == "GET":
         offset = int(request.GET.get("offset", 0))
         limit = int(request.GET.get("limit", 10))
-        result = db.get_user_feed(user_id, offset, limit)
+        cursor = request.GET.get("cursor")
+        rank = request.GET.get("rank", "recent")
+        result = db.get_user_feed(user_id, offset, limit, cursor, rank)
         return JsonResponse(result, status=get_status_code(result))
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
@@ -526,7 +552,15 @@ def get_chat_messages(request: HttpRequest, chat_id: int) -> JsonResponse:
     if request.method == "GET":
         offset = int(request.GET.get('offset', 0))
         limit = int(request.GET.get('limit', 10))
-        result = db.get_chat_messages(chat_id, offset, limit)
+        before_id = request.GET.get('before_id')
+        after_id = request.GET.get('after_id')
+        result = db.get_chat_messages(
+            chat_id,
+            offset,
+            limit,
+            int(before_id) if before_id else None,
+            int(after_id) if after_id else None
+        )
         return JsonResponse(result, status=get_status_code(result))
 
     return JsonResponse({"error": "Method not allowed"}, status=405)
@@ -654,12 +688,16 @@ def search(request: HttpRequest) -> JsonResponse:
         include_events = request.GET.get("includeEvents", "true").lower() == "true"
         include_organizations = request.GET.get("includeOrganizations", "true").lower() == "true"
         include_users = request.GET.get("includeUsers", "true").lower() == "true"
+        limit = int(request.GET.get("limit", 20))
+        cursor = request.GET.get("cursor")
         result = db.search(
             query,
             include_posts=include_posts,
             include_events=include_events,
             include_organizations=include_organizations,
             include_users=include_users,
+            limit=limit,
+            cursor=cursor,
         )
         return JsonResponse(result, status=get_status_code(result))
     return JsonResponse({"error": "Method not allowed"}, status=405)
@@ -673,6 +711,16 @@ def search_organizations(request: HttpRequest) -> JsonResponse:
         return JsonResponse(result, status=get_status_code(result))
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
+def typeahead_organizations(request: HttpRequest) -> JsonResponse:
+    if request.method == "GET":
+        query = request.GET.get("query")
+        if not query:
+            return JsonResponse({"error": "Missing query parameter"}, status=400)
+        limit = int(request.GET.get("limit", 10))
+        result = db.typeahead_organizations(query, limit)
+        return JsonResponse(result, status=get_status_code(result))
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
 def search_events(request: HttpRequest) -> JsonResponse:
     if request.method == "GET":
         query = request.GET.get("query")
@@ -682,6 +730,16 @@ def search_events(request: HttpRequest) -> JsonResponse:
         return JsonResponse(result, status=get_status_code(result))
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
+def flush_search_index(request: HttpRequest) -> JsonResponse:
+    ''' Waits until earlier writes are searchable, only routed when DEBUG is on so tests need not poll '''
+    if request.method == "POST":
+        if not hasattr(db, "flush_search_index"):
+            # Databases without a background indexer are searchable as soon as a write returns
+            return JsonResponse({"success": True, "message": "Search index is up to date"})
+        result = db.flush_search_index(timeout=5.0)
+        return JsonResponse(result, status=get_status_code(result))
+    return JsonResponse({"error": "Method not allowed"}, status=405)
+
 # Feedback
 def create_user_feedback(request: HttpRequest) -> JsonResponse:
     if request.method == "POST":
@@ -785,10 +843,12 @@ create_event = csrf_exempt(create_event)
 delete_event = csrf_exempt(delete_event)
 update_event = csrf_exempt(update_event)
 get_event = csrf_exempt(get_event)
+get_upcoming_events = csrf_exempt(get_upcoming_events)
 going_event = csrf_exempt(going_event)
 remove_going_event = csrf_exempt(remove_going_event)
 interested_event = csrf_exempt(interested_event)
 remove_interested_event = csrf_exempt(remove_interested_event)
+get_event_attendees = csrf_exempt(get_event_attendees)
 create_comment = csrf_exempt(create_comment)
 delete_comment = csrf_exempt(delete_comment)
 update_comment = csrf_exempt(update_comment)
@@ -813,6 +873,8 @@ react_to_chat_message = csrf_exempt(react_to_chat_message)
 remove_chat_message_reaction = csrf_exempt(remove_chat_message_reaction)
 search = csrf_exempt(search)
 search_organizations = csrf_exempt(search_organizations)
+typeahead_organizations = csrf_exempt(typeahead_organizations)
 search_events = csrf_exempt(search_events)
+flush_search_index = csrf_exempt(flush_search_index)
 create_user_feedback = csrf_exempt(create_user_feedback)
 generate_presigned_url = csrf_exempt(generate_presigned_url)
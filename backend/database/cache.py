@@ -0,0 +1,98 @@
+'''
+LRU response cache for DummyDatabase feed pages
+'''
+
+from collections import OrderedDict
+import json
+from time import monotonic
+
+class FeedCache:
+    ''' LRU cache of feed responses, capped by the approximate JSON size of the cached responses.
+
+        Entries are grouped by the user they were built for, so a write only drops the
+        pages of the users whose feeds it can change.
+    '''
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[dict, int, int, float | None]] = OrderedDict() # key -> (response, size, user_id, expires_at)
+        self._user_keys: dict[int, set[tuple]] = {} # user_id -> keys of their cached pages
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple) -> dict | None:
+        ''' Returns the cached response for key, or None on a miss '''
+        entry = self._entries.get(key)
+        if entry is not None and entry[3] is not None and entry[3] <= monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: tuple, user_id: int, response: dict, ttl: float | None = None):
+        ''' Caches a response built for user_id, evicting least recently used pages past the size cap '''
+        size = len(json.dumps(response, default=str))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = None if ttl is None else monotonic() + ttl
+        self._entries[key] = (response, size, user_id, expires_at)
+        self._user_keys.setdefault(user_id, set()).add(key)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, user_ids):
+        ''' Drops every cached page of the given users '''
+        for user_id in user_ids:
+            for key in self._user_keys.pop(user_id, ()):
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_audience(self, owner_id: int, audience):
+        ''' Drops the cached pages of owner_id and of the users in audience.
+            Only users with cached pages are visited, walking whichever of audience and
+            the cached users is smaller and testing membership in the other.
+        '''
+        cached = self._user_keys
+        if len(audience) < len(cached):
+            user_ids = [user_id for user_id in audience if user_id in cached]
+        else:
+            user_ids = [user_id for user_id in cached if user_id in audience]
+        user_ids.append(owner_id)
+        self.invalidate(user_ids)
+
+    def clear(self):
+        ''' Drops every cached page '''
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._user_keys.clear()
+        self._bytes = 0
+
+    def _remove(self, key: tuple):
+        response, size, user_id, _ = self._entries.pop(key)
+        self._bytes -= size
+        user_keys = self._user_keys.get(user_id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes
+        }
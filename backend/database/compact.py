@@ -0,0 +1,74 @@
+'''
+Compact in-memory containers for high-volume DummyDatabase relations
+'''
+
+from array import array
+from bisect import bisect_left
+
+class IdSet:
+    ''' Set of integer ids kept sorted in a compact array('q')
+
+        Stores 8 bytes per id instead of a hash set slot plus an int object.
+        Membership is a binary search, and add/discard shift the tail of the array,
+        which stays cheap for the sizes of a single post/event/account's edges.
+    '''
+    __slots__ = ('_ids',)
+
+    def __init__(self, ids=()):
+        self._ids = array('q', sorted(set(ids)))
+
+    def add(self, value: int) -> bool:
+        ''' Adds an id, returns False if it was already in the set '''
+        ids = self._ids
+        if not ids or value > ids[-1]:
+            ids.append(value)
+            return True
+        index = bisect_left(ids, value)
+        if ids[index] == value:
+            return False
+        ids.insert(index, value)
+        return True
+
+    def discard(self, value: int) -> bool:
+        ''' Removes an id, returns False if it was not in the set '''
+        ids = self._ids
+        index = bisect_left(ids, value)
+        if index == len(ids) or ids[index] != value:
+            return False
+        del ids[index]
+        return True
+
+    def __contains__(self, value: int) -> bool:
+        ids = self._ids
+        index = bisect_left(ids, value)
+        return index != len(ids) and ids[index] == value
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._ids[index].tolist()
+        return self._ids[index]
+
+    def __repr__(self) -> str:
+        return f"IdSet({self._ids.tolist()})"
+
+
+class MessageReaction:
+    ''' Reaction to a chat message '''
+    __slots__ = ('id', 'chat_id', 'message_id', 'user_id', 'reaction', 'created_at')
+
+    def __init__(self, id: int, chat_id: int, message_id: int, user_id: int, reaction: str, created_at: str):
+        self.id = id
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.user_id = user_id
+        self.reaction = reaction
+        self.created_at = created_at
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
@@ -332,12 +332,17 @@ class Database(ABC):
         '''
 
     @abstractmethod
-    def get_organization_posts(self, org_id: int) -> dict:
+    def get_organization_posts(self, org_id: int, include_descendants: bool = False,
+                               limit: int = 10, cursor: str | None = None) -> dict:
         '''
         Purpose:
-            Retrieve all posts made by an organization by its ID.
+            Retrieve all posts made by an organization by its ID, or with include_descendants,
+            a page of the posts made by the organization and all organizations below it, newest first.
         Pre-conditions:
             :param org_id: The ID of the organization whose posts are to be retrieved
+            :param include_descendants: Whether to include posts of child organizations (default is False)
+            :param limit: The maximum number of posts to retrieve with include_descendants (default is 10)
+            :param cursor: The 'next_cursor' of the previous page with include_descendants (optional)
         Post-conditions:
             (none)
         Returns:
@@ -346,6 +351,8 @@ class Database(ABC):
                             'success' is True if retrieval is successful, otherwise False.
                             'message' contains additional information about the result.
                             'data' contains the list of posts if successful.
+                            'next_cursor' is the cursor of the next page with include_descendants,
+                            or None if this is the last page.
         '''
 
     @abstractmethod
@@ -552,7 +559,7 @@ class Database(ABC):
             :param follower_id: The ID of the user or organization that is following
             :param followee_id: The ID of the user or organization to follow
         Post-conditions:
-            (none)
+            The followee's posts and events appear in the follower's feed.
         Returns:
             :return: dict: A dictionary containing the result of the follow operation
                             with keys 'success' and 'message'.
@@ -569,7 +576,7 @@ class Database(ABC):
             :param follower_id: The ID of the user or organization that is unfollowing
             :param followee_id: The ID of the user or organization to unfollow
         Post-conditions:
-            (none)
+            The followee's posts and events no longer appear in the follower's feed.
         Returns:
             :return: dict: A dictionary containing the result of the unfollow operation
                             with keys 'success' and 'message'.
@@ -734,6 +741,27 @@ class Database(ABC):
                             'data' contains the event information if successful.
         '''
 
+    @abstractmethod
+    def get_upcoming_events(self, start_time: str | None = None, end_time: str | None = None,
+                            org_id: int | None = None, limit: int = 50) -> dict:
+        '''
+        Purpose:
+            Retrieve the events taking place in a time range, ordered by start time.
+        Pre-conditions:
+            :param start_time: The start of the range as an ISO 8601 timestamp (default is now)
+            :param end_time: The end of the range as an ISO 8601 timestamp (default is 7 days after start_time)
+            :param org_id: Only include events by this organization and the organizations below it (optional)
+            :param limit: The maximum number of events to retrieve (default is 50)
+        Post-conditions:
+            (none)
+        Returns:
+            :return: dict: A dictionary containing the events
+                            with keys 'success' and 'data'.
+                            'success' is True if retrieval is successful, otherwise False.
+                            'message' contains additional information about the result.
+                            'data' contains the list of events overlapping the range if successful.
+        '''
+
     # Events Going/Interested
     @abstractmethod
     def going_event(self, event_id: int, user_id: int) -> dict:
@@ -809,6 +837,27 @@ class Database(ABC):
                             'message' contains additional information about the result.
         '''
 
+    @abstractmethod
+    def get_event_attendees(self, event_id: int, status: str = "going", offset: int = 0, limit: int = 50) -> dict:
+        '''
+        Purpose:
+            Retrieve a page of the users going to or interested in an event, ordered by user ID.
+        Pre-conditions:
+            :param event_id: The ID of the event
+            :param status: 'going' (default) or 'interested'
+            :param offset: The offset for pagination (default is 0)
+            :param limit: The maximum number of users to retrieve (default is 50)
+        Post-conditions:
+            (none)
+        Returns:
+            :return: dict: A dictionary containing the attendees
+                            with keys 'success', 'data' and 'count'.
+                            'success' is True if retrieval is successful, otherwise False.
+                            'message' contains additional information about the result.
+                            'data' contains the list of users (user_id, username, pfp_url) if successful.
+                            'count' is the total number of users with that status.
+        '''
+
     # Post/Event Comments
     @abstractmethod
     def create_comment(self, post_id: int, parent_id: int, author_id: int, content: str) -> dict:
@@ -1015,22 +1064,29 @@ class Database(ABC):
         '''
 
     @abstractmethod
-    def get_user_feed(self, user_id: int, offset: int = 0, limit: int = 10) -> dict:
+    def get_user_feed(self, user_id: int, offset: int = 0, limit: int = 10,
+                      cursor: str | None = None, rank: str = "recent") -> dict:
         '''
         Purpose:
-            Retrieve the feed of posts and events for a user.
+            Retrieve the home feed of a user: posts and events by the user and by the
+            users and organizations they follow, newest first.
         Pre-conditions:
             :param user_id: The ID of the user whose feed is to be retrieved
-            :param offset: The offset for pagination (default is 0)
+            :param offset: The number of items to skip, counted from the cursor if one is given (default is 0)
             :param limit: The maximum number of items to retrieve (default is 10)
+            :param cursor: The 'next_cursor' of the previous page, to retrieve the items after it (optional)
+            :param rank: 'recent' for newest first (default), or 'top' to order the most recent
+                         items by engagement score. Top pages are paged with offset only.
         Post-conditions:
             (none)
         Returns:
             :return: dict: A dictionary containing the feed information
-                            with keys 'success' and 'data'.
+                            with keys 'success', 'data' and 'next_cursor'.
                             'success' is True if feed retrieval is successful, otherwise False.
                             'message' contains additional information about the result.
                             'data' contains the list of posts and events if successful.
+                            'next_cursor' is the cursor of the next page, or None if this is the last
+                            page or the feed is ranked.
         '''
 
     # Messaging
@@ -1051,12 +1107,20 @@ class Database(ABC):
         '''
 
     @abstractmethod
-    def get_chat_messages(self, chat_id: int, offset: int = 0, limit: int = 10) -> dict:
+    def get_chat_messages(self, chat_id: int, offset: int = 0, limit: int = 10,
+                          before_id: int | None = None, after_id: int | None = None) -> dict:
         '''
         Purpose:
-            Retrieve the messages for the given chat.
+            Retrieve the messages for the given chat, oldest first.
+            If after_id is given, returns the first messages with an ID greater than after_id.
+            Otherwise if before_id is given, returns the last messages with an ID less than before_id.
+            Otherwise returns the messages starting at offset.
         Pre-conditions:
             :param chat_id: The ID of the chat whose messages are to be retrieved
+            :param offset: The offset for pagination (default is 0)
+            :param limit: The maximum number of messages to retrieve (default is 10)
+            :param before_id: Message ID cursor for loading older messages (optional)
+            :param after_id: Message ID cursor for loading newer messages (optional)
         Post-conditions:
             (none)
         Returns:
@@ -1174,6 +1238,7 @@ class Database(ABC):
         '''
         Purpose:
             Mark a message as read by a user.
+            All earlier messages in the chat are marked as read as well.
         Pre-conditions:
             :param chat_id: The ID of the chat to mark the message as read in
             :param message_id: The ID of the message to be marked as read
@@ -1228,31 +1293,38 @@ class Database(ABC):
     # Search
     @abstractmethod
     def search(self, query: str, include_posts: bool, include_events: bool,
-               include_organizations: bool, include_users: bool) -> dict:
+               include_organizations: bool, include_users: bool,
+               limit: int = 20, cursor: str | None = None) -> dict:
         '''
         Purpose:
-            Search for users and parent organizations based on a query string.
+            Search users, organizations, events and posts for a query string. A result
+            contains every word of the query, the last word may be partially typed.
+            Results are ordered by relevance, best first, one page at a time.
         Pre-conditions:
             :param query: The search query string
             :param include_posts: Whether to include posts in the search results
             :param include_events: Whether to include events in the search results
             :param include_organizations: Whether to include organizations in the search results
             :param include_users: Whether to include users in the search results
+            :param limit: Maximum number of results on the page
+            :param cursor: The next_cursor of the previous page, or None for the first page
         Post-conditions:
             (none)
         Returns:
             :return: dict: A dictionary containing the search results
-                            with keys 'success' and 'data'.
+                            with keys 'success', 'data', 'counts' and 'next_cursor'.
                             'success' is True if search is successful, otherwise False.
                             'message' contains additional information about the result.
-                            'data' contains the search results if successful.
+                            'data' contains the page of results, each with its type and score, if successful.
+                            'counts' contains the total number of matches of each included type.
+                            'next_cursor' fetches the following page, None on the last page.
         '''
 
     @abstractmethod
     def search_organizations(self, query: str) -> dict:
         '''
         Purpose:
-            Search for parent organizations based on a query string.
+            Search for parent organizations with a word in their name starting with the query string.
         Pre-conditions:
             :param query: The search query string
         Post-conditions:
@@ -1265,6 +1337,25 @@ class Database(ABC):
                             'data' contains the search results if successful.
         '''
 
+    @abstractmethod
+    def typeahead_organizations(self, query: str, limit: int = 10) -> dict:
+        '''
+        Purpose:
+            Suggest parent organizations while a name is being typed. Names starting with the
+            query come before names with a later word starting with it.
+        Pre-conditions:
+            :param query: The partially typed organization name
+            :param limit: Maximum number of suggestions to return
+        Post-conditions:
+            (none)
+        Returns:
+            :return: dict: A dictionary containing the suggestions
+                            with keys 'success' and 'data'.
+                            'success' is True if the lookup is successful, otherwise False.
+                            'message' contains additional information about the result.
+                            'data' contains the id, name, location and pfp_url of each suggested organization.
+        '''
+
     @abstractmethod
     def search_events(self, query: str) -> dict:
         '''
@@ -2,52 +2,152 @@
 Dummy database module for testing
 '''
 
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
+from heapq import merge, nsmallest
+from itertools import islice
+from operator import itemgetter
+from time import time
+from types import MappingProxyType
+import weakref
 
+import numpy as np
+
+from .cache import FeedCache
+from .compact import IdSet, MessageReaction
 from .database import Database
+from .pagination import decode_cursor, decode_score_cursor, encode_cursor, encode_score_cursor
+from .ranking import (DEFAULT_RANK_WEIGHTS, SEARCH_NAME_BOOST, SEARCH_RECENCY_BOOST, SEARCH_RECENCY_HALF_LIFE,
+                      SEARCH_TYPE_ORDER, FeedSignals, score_feed, timestamp_to_epoch)
+from .indexer import SearchIndexer
+from .search_index import InvertedIndex, PrefixIndex
+
+_get_id = itemgetter('id')
+
+RANKED_FEED_CACHE_TTL = 60.0 # seconds, ranked pages also go stale as their items age
+UPCOMING_EVENTS_DEFAULT_RANGE = 7 * 24 * 3600.0 # seconds
+
+def _feed_key(item: dict) -> tuple[str, int]:
+    ''' Sort key of a post or event in feeds and timelines '''
+    return (item.get('timestamp', ''), item['id'])
+
+def _iter_newest_first(keys: list, end: int):
+    ''' Iterates keys[:end] backwards without copying it '''
+    return (keys[index] for index in range(end - 1, -1, -1))
 
 class DummyDatabase(Database):
     ''' Dummy database implementation for testing only
     '''
-    def __init__(self):
-        ''' Initialize the Dummy database '''
+    def __init__(self, fanout_threshold: int = 1000, rank_window: int = 5000,
+                 rank_weights: dict[str, float] | None = None, feed_cache_bytes: int = 16 * 1024 * 1024):
+        ''' Initialize the Dummy database
+
+            Authors with at least fanout_threshold followers are not pushed into their
+            followers' timelines, their items are pulled in when the feed is read instead.
+            Ranked feeds score the newest rank_window items with rank_weights
+            (see ranking.DEFAULT_RANK_WEIGHTS). Feed pages are cached up to feed_cache_bytes.
+        '''
         self._account_id = 1
         self._post_id = 1
         self._chat_id = 1
+        self._comment_id = 1
+        self._message_id = 1
+        self._chat_member_id = 1
+        self._reaction_id = 1
 
         self.users: list[dict] = []
         self.organizations: list[dict] = []
-        self.org_admins: list[dict] = [] # [org_id, user_id]
-        self.org_members: list[dict] = [] # [org_id, user_id]
-        self.org_congregants: list[dict] = [] # [org_id, user_id]
+        self.org_admins: dict[int, set[int]] = {} # org_id -> admin user ids
+        self.org_members: dict[int, set[int]] = {} # org_id -> member user ids
+        self.org_congregants: dict[int, set[int]] = {} # org_id -> congregant user ids
+        self.user_admin_orgs: dict[int, set[int]] = {} # user_id -> org ids the user is an admin of
+        self.user_member_orgs: dict[int, set[int]] = {} # user_id -> org ids the user is a member of
+        self.user_congregant_orgs: dict[int, set[int]] = {} # user_id -> org ids the user is a congregant of
 
         self.posts: list[dict] = [] # [author_id, caption, image_url, location, post_id]
         self.events: list[dict] = []
-        self.comments: list[dict] = []
-        self.likes: list[dict] = []
-        self.dislikes: list[dict] = []
-        self.followers: list[dict] = [] # list of dicts with keys: follower_id, followee_id
-        self.going_events: list[dict] = []
-        self.interested_events: list[dict] = []
+        self.comments: list[dict] = [] # oldest first
+        self.likes: dict[int, IdSet] = {} # post_id -> ids of users who liked
+        self.dislikes: dict[int, IdSet] = {} # post_id -> ids of users who disliked
+        self.followers: dict[int, IdSet] = {} # followee_id -> ids of followers
+        self.following: dict[int, IdSet] = {} # follower_id -> ids of followees
+        self.going_events: dict[int, IdSet] = {} # event_id -> ids of users going
+        self.interested_events: dict[int, IdSet] = {} # event_id -> ids of interested users
 
         # Messaging
         self.chats: list[dict] = [] # [id, created_at]
         self.group_chats: list[dict] = [] # [id, name, image_url, created_at]
-        self.chat_members: list[dict] = [] # [id, chat_id, user_id, joined_at, is_org, role]
-        self.messages: list[dict] = [] # [id, chat_id, sender_id, content, is_deleted, created_at]
-        self.message_read: list[dict] = [] # [id, message_id, user_id, read_at]
-        self.message_reactions: list[dict] = [] # [id, message_id, user_id, reaction, created_at]
+        self.chat_members: dict[int, dict] = {} # member row id -> [id, chat_id, user_id, joined_at, is_org, role]
+        self.messages: dict[int, list[dict]] = {} # chat_id -> [id, chat_id, sender_id, content, is_deleted, created_at] in id order
+        self.message_read: dict[tuple[int, int], int] = {} # (chat_id, user_id) -> id of last read message
+        self.message_reactions: dict[int, MessageReaction] = {} # reaction_id -> reaction
 
         # Feedback
         self.feedback: list[dict] = [] # [first_name, last_name, email, feedback, created_at]
 
+        # Primary key indexes (id -> record), kept in sync with the tables above
+        self._user_index: dict[int, dict] = {}
+        self._organization_index: dict[int, dict] = {}
+        self._post_index: dict[int, dict] = {}
+        self._event_index: dict[int, dict] = {}
+        self._comment_index: dict[int, dict] = {}
+        self._chat_index: dict[int, dict] = {} # dms and group chats share chat ids
+        self._message_index: dict[int, dict] = {}
+
+        # Chat membership
+        self._group_chat_ids: set[int] = set()
+        self._chat_member_index: dict[int, dict[int, dict]] = {} # chat_id -> {user_id: chat member row}
+        self._user_chats: dict[int, set[int]] = {} # user_id -> ids of chats the user is in
+        self._unread_counts: dict[tuple[int, int], int] = {} # (chat_id, user_id) -> messages from others past the read watermark
+
+        # Organization hierarchy closure
+        self._org_children: dict[int, list[int]] = {} # parent_id -> direct child org ids (0 for top-level)
+        self._org_ancestors: dict[int, set[int]] = {} # org_id -> ids of all organizations above it
+        self._org_descendants: dict[int, set[int]] = {} # org_id -> ids of all organizations below it
+
+        # Comment tree, oldest first (comments are displayed newest first)
+        self._post_comments: dict[int, list[int]] = {} # post_id -> top-level comment ids
+        self._comment_replies: dict[int, list[int]] = {} # parent comment id -> reply ids
+
+        # Events by start time, for time range queries
+        self._event_starts: list[tuple[float, int]] = [] # sorted (start time in seconds, event_id)
+        self._event_ends: dict[int, float] = {} # event_id -> end time in seconds
+        self._max_event_duration = 0.0 # longest event seen, bounds how far back an overlapping event can start
+
+        # Full-text search over users, organizations, events and posts
+        self._search_index = InvertedIndex()
+        # Typeahead over the names of top-level organizations
+        self._org_typeahead = PrefixIndex()
+        # Writes enqueue changed documents, a worker thread applies them to both indexes in batches
+        self._search_indexer = SearchIndexer(self._apply_search_changes)
+        # Stops the worker thread when this database is garbage collected without close()
+        weakref.finalize(self, self._search_indexer.close, 0)
+
+        # Home timelines, materialized on write, oldest first (feeds are displayed newest first)
+        self._author_items: dict[int, list[tuple[str, int]]] = {} # author_id -> feed keys of their posts and events
+        self._author_posts: dict[int, list[tuple[str, int]]] = {} # author_id -> feed keys of their posts only
+        self._timelines: dict[int, list[tuple[str, int]]] = {} # account_id -> feed keys of their home timeline
+        self._pull_authors: set[int] = set() # authors at or above the fan-out threshold, merged in at read time
+        self.fanout_threshold = fanout_threshold
+        self.feed_counters = {"pushes": 0, "pulls": 0} # timeline inserts and author timelines pulled, since startup
+        self.last_feed_counters = {"pushes": 0, "pulls": 0} # the same, for the last feed write or read
+        self._item_epochs: dict[int, float] = {} # post/event id -> timestamp in seconds, for ranking
+        self._feed_signals = FeedSignals() # ranking inputs of every published post/event
+        self.rank_window = rank_window
+        self.rank_weights = {**DEFAULT_RANK_WEIGHTS, **(rank_weights or {})}
+        self._feed_cache = FeedCache(feed_cache_bytes)
+
         self.__create_dummy_data()
+        self._build_indexes()
 
     def __create_dummy_data(self):
         ''' Create some dummy data for testing '''
         self._account_id = 3
-        self._post_id = 3
+        self._post_id = 5
         self._chat_id = 3
+        self._comment_id = 6
+        self._message_id = 3
+        self._chat_member_id = 3
         self.users = [
             {"id": 1, "username": "user1", "password": "pass1", "pfp_url": "https://cw39.com/wp-content/uploads/sites/10/2016/01/s036012017.jpg",
              "first_name": "Big", "last_name": "Monkey", "email": "bigmonkay@gmail.com", "bio": "I am a really big monkey"},
@@ -75,47 +175,479 @@ class DummyDatabase(Database):
         self.events = [
             {"id": 3, "author_id": 1, "title": "Event by user1", "description": "Description of event", 
              "start_time": "2023-10-01T10:00:00Z", "end_time": "2023-10-01T12:00:00Z",
-             "location": "Location1", "type": "event",
+             "location": "Location1", "type": "event", "timestamp": "2023-09-25T10:00:00Z",
              "image_url": "https://encrypted-tbn0.gstatic.com/images?q=tbn:ANd9GcRy5pXMLHcrqN-HmGJ97Rr9bcoAf8_EqzZZOg&s"},
             {"id": 4, "author_id": 2, "title": "Event by user2", "description": "Description of event", 
              "start_time": "2023-10-02T10:00:00Z", "end_time": "2023-10-02T12:00:00Z",
-             "location": "Location2", "type": "event",
+             "location": "Location2", "type": "event", "timestamp": "2023-09-26T10:00:00Z",
              "image_url": "https://encrypted-tbn0.gstatic.com/images?q=tbn:ANd9GcRy5pXMLHcrqN-HmGJ97Rr9bcoAf8_EqzZZOg&s"},
         ]
-        self.comments = [
-            {"id": 1, "post_id": 1, "parent_id": 0, "author_id": 2, "content": "Comment on post by user1"},
-            {"id": 3, "post_id": 1, "parent_id": 0, "author_id": 2, "content": "Another comment on post by user1"},
-            {"id": 4, "post_id": 1, "parent_id": 0, "author_id": 2, "content": "3rd comment on post by user1"},
+        self.comments = [ # oldest first, new comments are appended
+            {"id": 2, "post_id": 2, "parent_id": 0, "author_id": 1, "content": "Comment on post by user2"},
             {"id": 5, "post_id": 1, "parent_id": 3, "author_id": 1, "content": "user2 replies to comment by user1"},
-            {"id": 2, "post_id": 2, "parent_id": 0, "author_id": 1, "content": "Comment on post by user2"}
-        ]
-        self.likes = [
-            {"post_id": 1, "user_id": 2},
-            {"post_id": 2, "user_id": 1}
-        ]
-        self.going_events = [
-            {"event_id": 3, "user_id": 1},
-            {"event_id": 4, "user_id": 2}
+            {"id": 4, "post_id": 1, "parent_id": 0, "author_id": 2, "content": "3rd comment on post by user1"},
+            {"id": 3, "post_id": 1, "parent_id": 0, "author_id": 2, "content": "Another comment on post by user1"},
+            {"id": 1, "post_id": 1, "parent_id": 0, "author_id": 2, "content": "Comment on post by user1"}
         ]
+        self.likes = {
+            1: IdSet([2]),
+            2: IdSet([1])
+        }
+        self.followers = {
+            1: IdSet([2]),
+            2: IdSet([1])
+        }
+        self.following = {
+            1: IdSet([2]),
+            2: IdSet([1])
+        }
+        self.going_events = {
+            3: IdSet([1]),
+            4: IdSet([2])
+        }
         self.chats = [
             {"id": 1, "created_at": "2023-10-01T10:00:00Z"}
         ]
         self.group_chats = []
-        self.chat_members = [
-            {"id": 1, "chat_id": 1, "user_id": 1, "joined_at": "2023-10-01T10:00:00Z", "is_org": False, "role": "member"},
-            {"id": 2, "chat_id": 1, "user_id": 2, "joined_at": "2023-10-01T10:00:00Z", "is_org": False, "role": "member"}
-        ]
-        self.messages = [
-            {"id": 1, "chat_id": 1, "sender_id": 1, "content": "Hello, how are you?", "is_deleted": False, "created_at": "2023-10-01T10:00:00Z"},
-            {"id": 2, "chat_id": 1, "sender_id": 2, "content": "I'm good, thank you!", "is_deleted": False, "created_at": "2023-10-01T10:01:00Z"}
-        ]
-        self.message_read = [
-            {"id": 1, "message_id": 1, "user_id": 1, "read_at": "2023-10-01T10:00:00Z"},
-            {"id": 2, "message_id": 2, "user_id": 2, "read_at": "2023-10-01T10:01:00Z"}
-        ]
-        self.message_reactions = [
-            {"id": 1, "message_id": 1, "user_id": 1, "reaction": "like", "created_at": "2023-10-01T10:00:00Z"},
-        ]
+        self.chat_members = {
+            1: {"id": 1, "chat_id": 1, "user_id": 1, "joined_at": "2023-10-01T10:00:00Z", "is_org": False, "role": "member"},
+            2: {"id": 2, "chat_id": 1, "user_id": 2, "joined_at": "2023-10-01T10:00:00Z", "is_org": False, "role": "member"}
+        }
+        self.messages = {
+            1: [
+                {"id": 1, "chat_id": 1, "sender_id": 1, "content": "Hello, how are you?", "is_deleted": False, "created_at": "2023-10-01T10:00:00Z"},
+                {"id": 2, "chat_id": 1, "sender_id": 2, "content": "I'm good, thank you!", "is_deleted": False, "created_at": "2023-10-01T10:01:00Z"}
+            ]
+        }
+        self.message_read = {
+            (1, 1): 1,
+            (1, 2): 2
+        }
+        self.message_reactions = {
+            1: MessageReaction(1, 1, 1, 1, "like", "2023-10-01T10:00:00Z")
+        }
+        self._reaction_id = 2
+
+    def _build_indexes(self):
+        ''' Rebuild all lookup indexes from the tables - INTERNAL USE ONLY '''
+        self._user_index = {user['id']: user for user in self.users}
+        self._organization_index = {org['id']: org for org in self.organizations}
+        self._post_index = {post['id']: post for post in self.posts}
+        self._event_index = {event['id']: event for event in self.events}
+        self._comment_index = {comment['id']: comment for comment in self.comments}
+        self._chat_index = {chat['id']: chat for chat in self.chats + self.group_chats}
+        self._message_index = {message['id']: message for chat_log in self.messages.values() for message in chat_log}
+
+        self._group_chat_ids = {chat['id'] for chat in self.group_chats}
+        self._chat_member_index = {}
+        self._user_chats = {}
+        for member in self.chat_members.values():
+            self._chat_member_index.setdefault(member['chat_id'], {})[member['user_id']] = member
+            self._user_chats.setdefault(member['user_id'], set()).add(member['chat_id'])
+
+        self._unread_counts = {}
+        for chat_id, chat_members in self._chat_member_index.items():
+            for user_id in chat_members:
+                watermark = self.message_read.get((chat_id, user_id), 0)
+                self._unread_counts[(chat_id, user_id)] = self._count_messages_from_others(chat_id, user_id, watermark)
+
+        self._post_comments = {}
+        self._comment_replies = {}
+        for comment in self.comments:
+            self._add_comment_to_tree(comment)
+
+        self._org_children = {}
+        self._org_ancestors = {}
+        self._org_descendants = {}
+        for org in self.organizations:
+            self._org_children.setdefault(org.get('parent_id', 0), []).append(org['id'])
+        for org in self.organizations:
+            ancestors = set()
+            parent_id = org.get('parent_id', 0)
+            while parent_id and parent_id not in ancestors:
+                ancestors.add(parent_id)
+                self._org_descendants.setdefault(parent_id, set()).add(org['id'])
+                parent = self._organization_index.get(parent_id)
+                parent_id = parent.get('parent_id', 0) if parent else 0
+            self._org_ancestors[org['id']] = ancestors
+
+        self._event_starts = []
+        self._event_ends = {}
+        self._max_event_duration = 0.0
+        for event in self.events:
+            self._index_event_time(event)
+
+        self.rebuild_search_index()
+
+        self._build_timelines()
+
+    def _build_timelines(self):
+        ''' Rebuild the materialized home timelines - INTERNAL USE ONLY '''
+        self._author_items = {}
+        self._author_posts = {}
+        self._timelines = {}
+        self._item_epochs = {}
+        self._feed_signals = FeedSignals(len(self.posts) + len(self.events) + 1)
+        self._pull_authors = {author_id for author_id in self.followers
+                              if self._count_other_followers(author_id) >= self.fanout_threshold}
+        for item in sorted(self.posts + self.events, key=_feed_key):
+            self._publish_item(item)
+
+    def _link_organization(self, org_id: int, parent_id: int):
+        ''' Attaches an organization and its subtree under a parent in the hierarchy closure - INTERNAL USE ONLY '''
+        self._org_children.setdefault(parent_id, []).append(org_id)
+        if parent_id == 0:
+            return
+        ancestors = {parent_id} | self._org_ancestors.get(parent_id, set())
+        subtree = {org_id} | self._org_descendants.get(org_id, set())
+        for ancestor_id in ancestors:
+            self._org_descendants.setdefault(ancestor_id, set()).update(subtree)
+        for descendant_id in subtree:
+            self._org_ancestors.setdefault(descendant_id, set()).update(ancestors)
+
+    def _unlink_organization(self, org_id: int, parent_id: int):
+        ''' Detaches an organization and its subtree from its parent in the hierarchy closure - INTERNAL USE ONLY '''
+        siblings = self._org_children.get(parent_id, [])
+        if org_id in siblings:
+            siblings.remove(org_id)
+        ancestors = set(self._org_ancestors.get(org_id, ()))
+        subtree = {org_id} | self._org_descendants.get(org_id, set())
+        for ancestor_id in ancestors:
+            self._org_descendants.get(ancestor_id, set()).difference_update(subtree)
+        for descendant_id in subtree:
+            self._org_ancestors.get(descendant_id, set()).difference_update(ancestors)
+
+    def _index_event_time(self, event: dict):
+        ''' Adds an event to the start time index - INTERNAL USE ONLY '''
+        start = timestamp_to_epoch(event.get('start_time'))
+        end = max(timestamp_to_epoch(event.get('end_time')), start)
+        insort(self._event_starts, (start, event['id']))
+        self._event_ends[event['id']] = end
+        # Never shrinks on delete, a stale bound only widens the scan
+        if start:
+            self._max_event_duration = max(self._max_event_duration, end - start)
+
+    def _unindex_event_time(self, event: dict):
+        ''' Removes an event from the start time index - INTERNAL USE ONLY '''
+        key = (timestamp_to_epoch(event.get('start_time')), event['id'])
+        index = bisect_left(self._event_starts, key)
+        if index < len(self._event_starts) and self._event_starts[index] == key:
+            del self._event_starts[index]
+        self._event_ends.pop(event['id'], None)
+
+    def _index_user_text(self, user: dict):
+        ''' Adds or refreshes a user in the search index - INTERNAL USE ONLY '''
+        self._search_index.add('user', user['id'], (user.get('username'), SEARCH_NAME_BOOST),
+                               (user.get('first_name'), SEARCH_NAME_BOOST), (user.get('last_name'), SEARCH_NAME_BOOST),
+                               (user.get('bio'), 1.0))
+
+    def _index_organization_text(self, org: dict):
+        ''' Adds or refreshes an organization in the search index - INTERNAL USE ONLY '''
+        self._search_index.add('organization', org['id'], (org.get('name'), SEARCH_NAME_BOOST),
+                               (org.get('description'), 1.0))
+
+    def _index_organization_name(self, org: dict):
+        ''' Adds, refreshes or drops an organization in the typeahead index - INTERNAL USE ONLY '''
+        if org.get('parent_id') == 0:
+            self._org_typeahead.add(org['id'], org.get('name'))
+        else:
+            self._org_typeahead.remove(org['id'])
+
+    def _index_item_text(self, item: dict):
+        ''' Adds or refreshes a post or event in the search index - INTERNAL USE ONLY '''
+        if item['type'] == 'event':
+            self._search_index.add('event', item['id'], (item.get('title'), SEARCH_NAME_BOOST),
+                                   (item.get('description'), 1.0))
+        else:
+            self._search_index.add('post', item['id'], (item.get('caption'), 1.0))
+
+    def _get_search_table(self, doc_type: str) -> dict[int, dict]:
+        ''' Returns the id -> record index of a searchable type - INTERNAL USE ONLY '''
+        return {
+            'user': self._user_index,
+            'organization': self._organization_index,
+            'event': self._event_index,
+            'post': self._post_index
+        }[doc_type]
+
+    def _get_search_result(self, doc_type: str, doc_id: int) -> dict:
+        ''' Returns a copy of a searchable record tagged with its type - INTERNAL USE ONLY '''
+        return {**self._get_search_table(doc_type)[doc_id], "type": doc_type}
+
+    def _apply_search_changes(self, keys: list[tuple[str, int]]):
+        ''' Brings the search indexes up to date with the current state of the given documents,
+            runs on the search indexer's worker thread - INTERNAL USE ONLY '''
+        for doc_type, doc_id in keys:
+            record = self._get_search_table(doc_type).get(doc_id)
+            if record is None:
+                self._search_index.remove(doc_type, doc_id)
+                if doc_type == 'organization':
+                    self._org_typeahead.remove(doc_id)
+            elif doc_type == 'user':
+                self._index_user_text(record)
+            elif doc_type == 'organization':
+                self._index_organization_text(record)
+                self._index_organization_name(record)
+            else:
+                self._index_item_text(record)
+
+    def _get_feed_item(self, item_id: int) -> dict | None:
+        ''' Returns the post or event with the given id - INTERNAL USE ONLY '''
+        return self._post_index.get(item_id) or self._event_index.get(item_id)
+
+    def _get_timeline_owners(self, author_id: int):
+        ''' Returns the ids of the accounts whose timelines an author's items are pushed to - INTERNAL USE ONLY '''
+        if author_id in self._pull_authors:
+            return {author_id}
+        return {author_id, *self.followers.get(author_id, ())}
+
+    def _publish_item(self, item: dict) -> int:
+        ''' Pushes a post or event onto its author's and followers' timelines,
+            returns the number of timelines pushed to - INTERNAL USE ONLY '''
+        key = _feed_key(item)
+        self._item_epochs[item['id']] = timestamp_to_epoch(key[0])
+        self._feed_signals.add(item['id'], self._item_epochs[item['id']])
+        self._refresh_item_signals(item['id'])
+        insort(self._author_items.setdefault(item['author_id'], []), key)
+        if item['type'] == 'post':
+            insort(self._author_posts.setdefault(item['author_id'], []), key)
+        owners = self._get_timeline_owners(item['author_id'])
+        for account_id in owners:
+            insort(self._timelines.setdefault(account_id, []), key)
+        return len(owners)
+
+    def _unpublish_item(self, item: dict):
+        ''' Removes a post or event from its author's and followers' timelines - INTERNAL USE ONLY '''
+        key = _feed_key(item)
+        self._feed_signals.discard(item['id'])
+        timelines = [self._timelines.get(account_id, []) for account_id in self._get_timeline_owners(item['author_id'])]
+        author_lists = [self._author_items.get(item['author_id'], []), self._author_posts.get(item['author_id'], [])]
+        for keys in [*author_lists, *timelines]:
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                del keys[index]
+
+    def _refresh_item_signals(self, item_id: int):
+        ''' Copies a post or event's engagement counts into its ranking row - INTERNAL USE ONLY '''
+        self._feed_signals.update(item_id, len(self.likes.get(item_id, ())), len(self.dislikes.get(item_id, ())),
+                                  len(self._post_comments.get(item_id, ())), len(self.going_events.get(item_id, ())),
+                                  len(self.interested_events.get(item_id, ())))
+
+    def _get_other_followers(self, account_id: int) -> list[int]:
+        ''' Returns the followers of an account other than itself - INTERNAL USE ONLY '''
+        return [follower_id for follower_id in self.followers.get(account_id, ()) if follower_id != account_id]
+
+    def _count_other_followers(self, account_id: int) -> int:
+        ''' Returns the number of followers of an account other than itself, without listing them - INTERNAL USE ONLY '''
+        followers = self.followers.get(account_id, ())
+        return len(followers) - (account_id in followers)
+
+    def _backfill_timeline(self, account_id: int, author_id: int) -> int:
+        ''' Merges an author's items into an account's timeline, returns the number pushed - INTERNAL USE ONLY '''
+        author_keys = self._author_items.get(author_id, [])
+        self._timelines[account_id] = list(merge(self._timelines.get(account_id, []), author_keys))
+        return len(author_keys)
+
+    def _prune_timeline(self, account_id: int, author_id: int):
+        ''' Removes an author's items from an account's timeline - INTERNAL USE ONLY '''
+        author_keys = set(self._author_items.get(author_id, ()))
+        timeline = self._timelines.get(account_id, [])
+        timeline[:] = [key for key in timeline if key not in author_keys]
+
+    def _update_fanout_mode(self, author_id: int) -> int:
+        ''' Moves an author between push and pull when their follower count crosses the threshold,
+            returns the number of timeline pushes this caused - INTERNAL USE ONLY '''
+        follower_count = self._count_other_followers(author_id)
+        is_pull_author = author_id in self._pull_authors
+        # The follower list is only built when the author actually changes mode
+        if not is_pull_author and follower_count >= self.fanout_threshold:
+            self._pull_authors.add(author_id)
+            for follower_id in self._get_other_followers(author_id):
+                self._prune_timeline(follower_id, author_id)
+        elif is_pull_author and follower_count < self.fanout_threshold:
+            self._pull_authors.discard(author_id)
+            return sum(self._backfill_timeline(follower_id, author_id) for follower_id in self._get_other_followers(author_id))
+        return 0
+
+    def _invalidate_author_feeds(self, author_id: int):
+        ''' Drops the cached feed pages of every account whose feed can show an author's items - INTERNAL USE ONLY '''
+        self._feed_cache.invalidate_audience(author_id, self.followers.get(author_id, ()))
+
+    def _invalidate_profile_feeds(self, user_id: int):
+        ''' Drops the cached feed pages that can show a user's name or picture, on their own items
+            or in the comment previews of items they commented on - INTERNAL USE ONLY '''
+        self._invalidate_author_feeds(user_id)
+        # Profile changes are rare, so the comments are scanned rather than indexed by author
+        for post_id in {comment['post_id'] for comment in self.comments if comment['author_id'] == user_id}:
+            self._invalidate_item_feeds(post_id)
+
+    def _invalidate_item_feeds(self, item_id: int):
+        ''' Drops the cached feed pages that can show a post or event - INTERNAL USE ONLY '''
+        item = self._get_feed_item(item_id)
+        if item is not None:
+            self._invalidate_author_feeds(item['author_id'])
+
+    def _record_feed_counters(self, pushes: int = 0, pulls: int = 0):
+        ''' Records the push/pull work of a feed write or read - INTERNAL USE ONLY '''
+        self.last_feed_counters = {"pushes": pushes, "pulls": pulls}
+        self.feed_counters["pushes"] += pushes
+        self.feed_counters["pulls"] += pulls
+
+    def _add_comment_to_tree(self, comment: dict):
+        ''' Adds a comment to the comment tree indexes - INTERNAL USE ONLY '''
+        if comment['parent_id'] == 0:
+            self._post_comments.setdefault(comment['post_id'], []).append(comment['id'])
+            self._refresh_item_signals(comment['post_id'])
+        else:
+            self._comment_replies.setdefault(comment['parent_id'], []).append(comment['id'])
+
+    def _remove_comment_from_tree(self, comment: dict):
+        ''' Removes a comment from the comment tree indexes - INTERNAL USE ONLY '''
+        if comment['parent_id'] == 0:
+            siblings = self._post_comments.get(comment['post_id'], [])
+        else:
+            siblings = self._comment_replies.get(comment['parent_id'], [])
+        if comment['id'] in siblings:
+            siblings.remove(comment['id'])
+        if comment['parent_id'] == 0:
+            self._refresh_item_signals(comment['post_id'])
+
+    def _get_comment_page(self, comment_ids: list[int], offset: int, limit: int) -> list[dict]:
+        ''' Returns a newest-first page of an oldest-first comment id list - INTERNAL USE ONLY '''
+        end = len(comment_ids) - offset
+        if end <= 0 or limit <= 0:
+            return []
+        start = max(end - limit, 0)
+        return [self._comment_index[comment_id] for comment_id in reversed(comment_ids[start:end])]
+
+    def _count_messages_from_others(self, chat_id: int, user_id: int, after_id: int, up_to_id: int | None = None) -> int:
+        ''' Counts messages in a chat not sent by the user with after_id < id <= up_to_id - INTERNAL USE ONLY '''
+        chat_log = self.messages.get(chat_id, [])
+        start = bisect_right(chat_log, after_id, key=_get_id)
+        end = len(chat_log) if up_to_id is None else bisect_right(chat_log, up_to_id, key=_get_id)
+        return sum(1 for message in chat_log[start:end] if message['sender_id'] != user_id)
+
+    def _get_reaction_counts(self, post_id: int) -> dict:
+        ''' Returns like/dislike counts for a post - INTERNAL USE ONLY '''
+        return {
+            "like_count": len(self.likes.get(post_id, ())),
+            "dislike_count": len(self.dislikes.get(post_id, ()))
+        }
+
+    def _get_viewer_reactions(self, post_id: int, user_id: int) -> dict:
+        ''' Returns whether the given user liked or disliked a post - INTERNAL USE ONLY '''
+        return {
+            "user_liked": user_id in self.likes.get(post_id, ()),
+            "user_disliked": user_id in self.dislikes.get(post_id, ())
+        }
+
+    def _get_reaction_summary(self, post_id: int, user_id: int) -> dict:
+        ''' Returns like/dislike counts for a post and whether the given user voted - INTERNAL USE ONLY '''
+        return {**self._get_reaction_counts(post_id), **self._get_viewer_reactions(post_id, user_id)}
+
+    def _get_user_name_pfps(self, user_ids) -> dict[int, tuple[str, str]]:
+        ''' Returns username and profile picture url for each of the given user ids - INTERNAL USE ONLY '''
+        return {user_id: self._get_user_name_pfp(user_id) for user_id in set(user_ids)}
+
+    # Feed and comment responses are built from read-only payloads shared by every viewer,
+    # plus a small per-viewer overlay merged in when the response is serialized.
+    # Stored records are never written to while reading.
+    def _build_comment_payloads(self, comments: list[dict],
+                                reaction_counts: dict[int, dict] | None = None) -> list[MappingProxyType]:
+        ''' Builds the viewer-independent payloads of a batch of comments - INTERNAL USE ONLY '''
+        authors = self._get_user_name_pfps(comment['author_id'] for comment in comments)
+        if reaction_counts is None:
+            reaction_counts = {post_id: self._get_reaction_counts(post_id)
+                               for post_id in {comment['post_id'] for comment in comments}}
+        return [MappingProxyType({
+            **comment,
+            "author_name": authors[comment['author_id']][0],
+            "author_pfp": authors[comment['author_id']][1],
+            **reaction_counts[comment['post_id']],
+            "reply_count": len(self._comment_replies.get(comment['id'], ()))
+        }) for comment in comments]
+
+    def _build_feed_payloads(self, items: list[dict]) -> list[MappingProxyType]:
+        ''' Builds the viewer-independent payloads of a page of feed items: authors, counts and
+            comment previews. Each kind of data is resolved in one batched pass - INTERNAL USE ONLY '''
+        previews = {item['id']: self._get_comment_page(self._post_comments.get(item['id'], []), 0, 2)
+                    for item in items if item['type'] == 'post'}
+        reaction_counts = {item['id']: self._get_reaction_counts(item['id']) for item in items}
+        comment_payloads = iter(self._build_comment_payloads(
+            [comment for page in previews.values() for comment in page], reaction_counts))
+        previews = {item_id: tuple(next(comment_payloads) for _ in page) for item_id, page in previews.items()}
+        authors = self._get_user_name_pfps(item['author_id'] for item in items)
+        payloads = []
+        for item in items:
+            payload = {
+                **item,
+                "author_name": authors[item['author_id']][0],
+                "author_pfp": authors[item['author_id']][1],
+                **reaction_counts[item['id']],
+                "comment_count": len(self._post_comments.get(item['id'], ())),
+                "comments": previews.get(item['id'], ())
+            }
+            if item['type'] == 'event':
+                payload['going_count'] = len(self.going_events.get(item['id'], ()))
+                payload['interested_count'] = len(self.interested_events.get(item['id'], ()))
+            payloads.append(MappingProxyType(payload))
+        return payloads
+
+    def _get_viewer_overlay(self, payload: MappingProxyType, user_id: int) -> dict:
+        ''' Returns the per-viewer flags of a feed item - INTERNAL USE ONLY '''
+        overlay = self._get_viewer_reactions(payload['id'], user_id)
+        if payload['type'] == 'event':
+            overlay['user_going'] = user_id in self.going_events.get(payload['id'], ())
+            overlay['user_interested'] = user_id in self.interested_events.get(payload['id'], ())
+        return overlay
+
+    def _serialize_comments(self, payloads, user_id: int) -> list[dict]:
+        ''' Merges comment payloads with the viewer's overlay - INTERNAL USE ONLY '''
+        return [{**payload, **self._get_viewer_reactions(payload['post_id'], user_id)} for payload in payloads]
+
+    def _serialize_feed(self, payloads: list[MappingProxyType], user_id: int) -> list[dict]:
+        ''' Merges feed item payloads with the viewer's overlay - INTERNAL USE ONLY '''
+        return [{
+            **payload,
+            **self._get_viewer_overlay(payload, user_id),
+            "comments": self._serialize_comments(payload['comments'], user_id)
+        } for payload in payloads]
+
+    def _rank_feed_keys(self, keys: list[tuple[str, int]]) -> list[tuple[str, int]]:
+        ''' Orders newest-first feed keys by engagement score, ties stay newest first - INTERNAL USE ONLY '''
+        # The writes keep the inputs up to date, so this is one row lookup per key
+        columns = self._feed_signals.gather([item_id for _, item_id in keys])
+        scores = score_feed(time(), *columns, self.rank_weights)
+        order = np.argsort(-scores, kind='stable')
+        return [keys[index] for index in order]
+
+    def _get_organizations(self, org_ids) -> list[dict]:
+        ''' Returns the organizations with the given ids that still exist - INTERNAL USE ONLY '''
+        return [self._organization_index[org_id] for org_id in org_ids if org_id in self._organization_index]
+
+    @staticmethod
+    def _add_affiliation(org_users: dict[int, set[int]], user_orgs: dict[int, set[int]],
+                         org_id: int, user_id: int) -> bool:
+        ''' Adds a user/organization role pair to both directions of a role index,
+            returns False if it already existed - INTERNAL USE ONLY '''
+        users = org_users.setdefault(org_id, set())
+        if user_id in users:
+            return False
+        users.add(user_id)
+        user_orgs.setdefault(user_id, set()).add(org_id)
+        return True
+
+    @staticmethod
+    def _remove_affiliation(org_users: dict[int, set[int]], user_orgs: dict[int, set[int]],
+                            org_id: int, user_id: int) -> bool:
+        ''' Removes a user/organization role pair from both directions of a role index,
+            returns False if it did not exist - INTERNAL USE ONLY '''
+        users = org_users.get(org_id, set())
+        if user_id not in users:
+            return False
+        users.discard(user_id)
+        user_orgs[user_id].discard(org_id)
+        return True
 
     # Tests
     def get_test(self) -> dict:
@@ -159,6 +691,8 @@ class DummyDatabase(Database):
         user = {"id": self._account_id, **user_info}
         self._account_id += 1
         self.users.append(user)
+        self._user_index[user["id"]] = user
+        self._search_indexer.enqueue(('user', user['id']))
         return {
             "success": True,
             "message": "User created successfully",
@@ -166,81 +700,95 @@ class DummyDatabase(Database):
         }
 
     def delete_user(self, user_id: int) -> dict:
-        for user in self.users:
-            if user['id'] == user_id:
-                self.users.remove(user)
-                return {
-                    "success": True,
-                    "message": "User deleted successfully"
-                }
+        user = self._user_index.pop(user_id, None)
+        if user is None:
+            return {
+                "success": False,
+                "message": "User not found"
+            }
+        self.users.remove(user)
+        self._search_indexer.enqueue(('user', user_id))
+        self._invalidate_profile_feeds(user_id) # cached pages now show them as an unknown user
         return {
-            "success": False,
-            "message": "User not found"
+            "success": True,
+            "message": "User deleted successfully"
         }
 
     def user_change_password(self, user_id: int, new_password: str) -> dict:
-        for user in self.users:
-            if user['id'] == user_id:
-                user['password'] = new_password
-                return {
-                    "success": True,
-                    "message": "Password changed successfully"
-                }
+        user = self._user_index.get(user_id)
+        if user is None:
+            return {
+                "success": False,
+                "message": "User not found"
+            }
+        user['password'] = new_password
         return {
-            "success": False,
-            "message": "User not found"
+            "success": True,
+            "message": "Password changed successfully"
         }
 
     def update_user(self, user_id: int, user_info: dict) -> dict:
-        for user in self.users:
-            if user['id'] == user_id:
-                user.update(user_info)
-                return {
-                    "success": True,
-                    "message": "User updated successfully"
-                }
+        user = self._user_index.get(user_id)
+        if user is None:
+            return {
+                "success": False,
+                "message": "User not found"
+            }
+        profile = self._get_user_name_pfp(user_id)
+        user.update(user_info)
+        user['id'] = user_id # the primary key is not updatable
+        self._search_indexer.enqueue(('user', user_id))
+        if self._get_user_name_pfp(user_id) != profile:
+            self._invalidate_profile_feeds(user_id) # author names and pictures in cached pages
         return {
-            "success": False,
-            "message": "User not found"
+            "success": True,
+            "message": "User updated successfully"
         }
 
     def get_user(self, user_id: int) -> dict:
-        for user in self.users:
-            if user['id'] == user_id:
-                user['type'] = 'user'
-                return {
-                    "success": True,
-                    "message": "User found",
-                    "data": user
-                }
+        user = self._user_index.get(user_id)
+        if user is None:
+            return {
+                "success": False,
+                "message": "User not found"
+            }
         return {
-            "success": False,
-            "message": "User not found"
+            "success": True,
+            "message": "User found",
+            "data": {
+                **user,
+                "type": "user",
+                "follower_count": len(self.followers.get(user_id, ())),
+                "following_count": len(self.following.get(user_id, ()))
+            }
         }
 
     def get_user_organizations_admin(self, user_id: int) -> dict:
+        orgs = self._get_organizations(self.user_admin_orgs.get(user_id, ()))
         return {
             "success": True,
-            "message": "No organizations found for user - default hardcoded",
-            "data": []
+            "message": "User admin organizations retrieved successfully",
+            "data": orgs
         }
 
     def get_user_organizations_member(self, user_id: int) -> dict:
+        orgs = self._get_organizations(self.user_member_orgs.get(user_id, ()))
         return {
             "success": True,
-            "message": "No organizations found for user - default hardcoded",
-            "data": []
+            "message": "User member organizations retrieved successfully",
+            "data": orgs
         }
 
     def get_user_organizations_congregant(self, user_id: int) -> dict:
+        orgs = self._get_organizations(self.user_congregant_orgs.get(user_id, ()))
         return {
             "success": True,
-            "message": "No organizations found for user - default hardcoded",
-            "data": []
+            "message": "User congregant organizations retrieved successfully",
+            "data": orgs
         }
 
     def get_user_posts(self, user_id: int) -> dict:
-        user_posts = [post for post in self.posts if post['author_id'] == user_id]
+        user_posts = [self._post_index[post_id] for _, post_id in self._author_posts.get(user_id, [])]
         return {
             "success": True,
             "message": "User posts retrieved successfully",
@@ -248,7 +796,8 @@ class DummyDatabase(Database):
         }
 
     def get_user_followers(self, user_id: int) -> dict:
-        user_followers = [follower for follower in self.followers if follower['followee_id'] == user_id]
+        user_followers = [{"follower_id": follower_id, "followee_id": user_id}
+                          for follower_id in self.followers.get(user_id, ())]
         return {
             "success": True,
             "message": "User followers retrieved successfully",
@@ -256,7 +805,8 @@ class DummyDatabase(Database):
         }
 
     def get_user_following(self, user_id: int) -> dict:
-        user_following = [follower for follower in self.followers if follower['follower_id'] == user_id]
+        user_following = [{"follower_id": user_id, "followee_id": followee_id}
+                          for followee_id in self.following.get(user_id, ())]
         return {
             "success": True,
             "message": "User following retrieved successfully",
@@ -273,6 +823,9 @@ class DummyDatabase(Database):
         }
         self._account_id += 1
         self.organizations.append(org)
+        self._organization_index[org["id"]] = org
+        self._link_organization(org["id"], parent_id)
+        self._search_indexer.enqueue(('organization', org['id']))
         return {
             "success": True,
             "message": "Organization created successfully",
@@ -280,72 +833,135 @@ class DummyDatabase(Database):
         }
 
     def delete_organization(self, org_id: int) -> dict:
-        for org in self.organizations:
-            if org['id'] == org_id:
-                self.organizations.remove(org)
-                return {
-                    "success": True,
-                    "message": "Organization deleted successfully"
-                }
+        org = self._organization_index.pop(org_id, None)
+        if org is None:
+            return {
+                "success": False,
+                "message": "Organization not found"
+            }
+        self.organizations.remove(org)
+        self._search_indexer.enqueue(('organization', org_id))
+        # Child organizations keep their parent_id and stay grouped under the deleted id
+        self._unlink_organization(org_id, org.get('parent_id', 0))
         return {
-            "success": False,
-            "message": "Organization not found"
+            "success": True,
+            "message": "Organization deleted successfully"
         }
 
     def update_organization(self, org_id: int, name: str) -> dict:
-        for org in self.organizations:
-            if org['id'] == org_id:
-                org['name'] = name
-                return {
-                    "success": True,
-                    "message": "Organization updated successfully"
-                }
+        org = self._organization_index.get(org_id)
+        if org is None:
+            return {
+                "success": False,
+                "message": "Organization not found"
+            }
+        org['name'] = name
+        self._search_indexer.enqueue(('organization', org_id))
         return {
-            "success": False,
-            "message": "Organization not found"
+            "success": True,
+            "message": "Organization updated successfully"
         }
 
     def get_organization(self, org_id: int) -> dict:
-        for org in self.organizations:
-            if org['id'] == org_id:
-                org['type'] = 'organization'
-                return {
-                    "success": True,
-                    "message": "Organization found",
-                    "data": org
-                }
+        org = self._organization_index.get(org_id)
+        if org is None:
+            return {
+                "success": False,
+                "message": "Organization not found"
+            }
         return {
-            "success": False,
-            "message": "Organization not found"
+            "success": True,
+            "message": "Organization found",
+            "data": {
+                **org,
+                "type": "organization",
+                "follower_count": len(self.followers.get(org_id, ())),
+                "following_count": len(self.following.get(org_id, ()))
+            }
         }
     
+    def set_organization_parent(self, org_id: int, parent_id: int) -> dict:
+        org = self._organization_index.get(org_id)
+        if org is None:
+            return {
+                "success": False,
+                "message": "Organization not found"
+            }
+        if parent_id != 0 and parent_id not in self._organization_index:
+            return {
+                "success": False,
+                "message": "Parent organization not found"
+            }
+        if parent_id == org_id or self.is_child_organization(parent_id, org_id):
+            return {
+                "success": False,
+                "message": "Organization cannot be moved under itself"
+            }
+        self._unlink_organization(org_id, org.get('parent_id', 0))
+        org['parent_id'] = parent_id
+        self._link_organization(org_id, parent_id)
+        self._search_indexer.enqueue(('organization', org_id)) # typeahead only holds top-level organizations
+        return {
+            "success": True,
+            "message": "Organization parent updated successfully"
+        }
+
     def get_child_organization_ids(self, org_id: int) -> 'list[int]':
-        children = [org['id'] for org in self.organizations if org.get('parent_id') == org_id]
         all_children = []
-        for child_id in children:
+        stack = list(reversed(self._org_children.get(org_id, [])))
+        while stack:
+            child_id = stack.pop()
             all_children.append(child_id)
-            all_children.extend(self.get_child_organization_ids(child_id))
+            stack.extend(reversed(self._org_children.get(child_id, [])))
         return all_children
 
+    def is_child_organization(self, org_id: int, ancestor_id: int) -> bool:
+        return ancestor_id in self._org_ancestors.get(org_id, ())
+
     def get_organization_children(self, org_id: int) -> dict:
         child_ids = self.get_child_organization_ids(org_id)
-        children = [org for org in self.organizations if org['id'] in child_ids]
+        children = self._get_organizations(child_ids)
         return {
             "success": True,
             "message": "Organization children retrieved successfully",
             "data": children
         }
 
-    def get_organization_posts(self, org_id: int) -> dict:
-        org_posts = [post for post in self.posts if post.get('author_id') == org_id]
+    def get_organization_posts(self, org_id: int, include_descendants: bool = False,
+                               limit: int = 10, cursor: str | None = None) -> dict:
+        if not include_descendants:
+            org_posts = [self._post_index[post_id] for _, post_id in self._author_posts.get(org_id, [])]
+            return {
+                "success": True,
+                "message": "Organization posts retrieved successfully",
+                "data": org_posts
+            }
+
+        before_key = None
+        if cursor is not None:
+            try:
+                before_key = decode_cursor(cursor)
+            except ValueError:
+                return {
+                    "success": False,
+                    "message": "Invalid cursor"
+                }
+        # Stream the newest posts across the organization's subtree from each author's time-ordered list
+        sources = []
+        for author_id in [org_id, *self.get_child_organization_ids(org_id)]:
+            keys = self._author_posts.get(author_id, [])
+            end = len(keys) if before_key is None else bisect_left(keys, before_key)
+            sources.append(_iter_newest_first(keys, end))
+        page = list(islice(merge(*sources, reverse=True), max(limit, 0)))
         return {
             "success": True,
             "message": "Organization posts retrieved successfully",
-            "data": org_posts
+            "data": [self._post_index[post_id] for _, post_id in page],
+            "next_cursor": encode_cursor(*page[-1]) if page and len(page) == limit else None
         }
 
     def get_organization_admins(self, org_id: int) -> dict:
-        org_admins = [admin for admin in self.org_admins if admin['org_id'] == org_id]
+        org_admins = [{"org_id": org_id, "user_id": user_id} for user_id in self.org_admins.get(org_id, ())]
         return {
             "success": True,
             "message": "Organization admins retrieved successfully",
@@ -353,7 +969,7 @@ class DummyDatabase(Database):
         }
 
     def get_organization_members(self, org_id: int) -> dict:
-        org_members = [member for member in self.org_members if member['org_id'] == org_id]
+        org_members = [{"org_id": org_id, "user_id": user_id} for user_id in self.org_members.get(org_id, ())]
         return {
             "success": True,
             "message": "Organization members retrieved successfully",
@@ -361,7 +977,7 @@ class DummyDatabase(Database):
         }
 
     def get_organization_congregants(self, org_id: int) -> dict:
-        org_congregants = [congregant for congregant in self.org_congregants if congregant['org_id'] == org_id]
+        org_congregants = [{"org_id": org_id, "user_id": user_id} for user_id in self.org_congregants.get(org_id, ())]
         return {
             "success": True,
             "message": "Organization congregants retrieved successfully",
@@ -369,7 +985,8 @@ class DummyDatabase(Database):
         }
 
     def get_organization_followers(self, org_id: int) -> dict:
-        org_followers = [follower for follower in self.followers if follower['followee_id'] == org_id]
+        org_followers = [{"follower_id": follower_id, "followee_id": org_id}
+                         for follower_id in self.followers.get(org_id, ())]
         return {
             "success": True,
             "message": "Organization followers retrieved successfully",
@@ -377,7 +994,8 @@ class DummyDatabase(Database):
         }
 
     def get_organization_following(self, org_id: int) -> dict:
-        org_following = [following for following in self.followers if following['follower_id'] == org_id]
+        org_following = [{"follower_id": org_id, "followee_id": followee_id}
+                         for followee_id in self.following.get(org_id, ())]
         return {
             "success": True,
             "message": "Organization following retrieved successfully",
@@ -386,111 +1004,106 @@ class DummyDatabase(Database):
     
     # User/Organization Affiliation
     def add_organization_admin(self, org_id: int, user_id: int) -> dict:
-        if any(admin for admin in self.org_admins if admin['org_id'] == org_id and admin['user_id'] == user_id):
+        if not self._add_affiliation(self.org_admins, self.user_admin_orgs, org_id, user_id):
             return {
                 "success": True,
                 "message": "User is already an admin of the organization"
             }
-        self.org_admins.append({
-            "org_id": org_id,
-            "user_id": user_id
-        })
         return {
             "success": True,
             "message": "User added as organization admin successfully"
         }
     
     def remove_organization_admin(self, org_id: int, user_id: int) -> dict:
-        for admin in self.org_admins:
-            if admin['org_id'] == org_id and admin['user_id'] == user_id:
-                self.org_admins.remove(admin)
-                return {
-                    "success": True,
-                    "message": "User removed from organization admins successfully"
-                }
+        if not self._remove_affiliation(self.org_admins, self.user_admin_orgs, org_id, user_id):
+            return {
+                "success": False,
+                "message": "User is not an admin of the organization"
+            }
         return {
-            "success": False,
-            "message": "User is not an admin of the organization"
+            "success": True,
+            "message": "User removed from organization admins successfully"
         }
     
     def add_organization_member(self, org_id: int, user_id: int) -> dict:
-        if any(member for member in self.org_members if member['org_id'] == org_id and member['user_id'] == user_id):
+        if not self._add_affiliation(self.org_members, self.user_member_orgs, org_id, user_id):
             return {
                 "success": True,
                 "message": "User is already a member of the organization"
             }
-        self.org_members.append({
-            "org_id": org_id,
-            "user_id": user_id
-        })
         return {
             "success": True,
             "message": "User added as organization member successfully"
         }
     
     def remove_organization_member(self, org_id: int, user_id: int) -> dict:
-        for member in self.org_members:
-            if member['org_id'] == org_id and member['user_id'] == user_id:
-                self.org_members.remove(member)
-                return {
-                    "success": True,
-                    "message": "User removed from organization members successfully"
-                }
+        if not self._remove_affiliation(self.org_members, self.user_member_orgs, org_id, user_id):
+            return {
+                "success": False,
+                "message": "User is not a member of the organization"
+            }
         return {
-            "success": False,
-            "message": "User is not a member of the organization"
+            "success": True,
+            "message": "User removed from organization members successfully"
         }
     
     def add_organization_congregant(self, org_id: int, user_id: int) -> dict:
-        if any(congregant for congregant in self.org_congregants if congregant['org_id'] == org_id and congregant['user_id'] == user_id):
+        if not self._add_affiliation(self.org_congregants, self.user_congregant_orgs, org_id, user_id):
             return {
                 "success": True,
                 "message": "User is already a congregant of the organization"
             }
-        self.org_congregants.append({
-            "org_id": org_id,
-            "user_id": user_id
-        })
         return {
             "success": True,
             "message": "User added as organization congregant successfully"
         }
     
     def remove_organization_congregant(self, org_id: int, user_id: int) -> dict:
-        for congregant in self.org_congregants:
-            if congregant['org_id'] == org_id and congregant['user_id'] == user_id:
-                self.org_congregants.remove(congregant)
-                return {
-                    "success": True,
-                    "message": "User removed from organization congregants successfully"
-                }
+        if not self._remove_affiliation(self.org_congregants, self.user_congregant_orgs, org_id, user_id):
+            return {
+                "success": False,
+                "message": "User is not a congregant of the organization"
+            }
         return {
-            "success": False,
-            "message": "User is not a congregant of the organization"
+            "success": True,
+            "message": "User removed from organization congregants successfully"
         }
 
     # Follow/Unfollow
     def follow(self, follower_id: int, followee_id: int) -> dict:
-        self.followers.append({
-            "follower_id": follower_id,
-            "followee_id": followee_id
-        })
+        if not self.following.setdefault(follower_id, IdSet()).add(followee_id):
+            return {
+                "success": True,
+                "message": "Already following"
+            }
+        self.followers.setdefault(followee_id, IdSet()).add(follower_id)
+        if follower_id != followee_id and followee_id not in self._pull_authors:
+            # Backfill the followee's existing items, unless the follow made them a pull author
+            pushes = self._update_fanout_mode(followee_id)
+            if followee_id not in self._pull_authors:
+                pushes += self._backfill_timeline(follower_id, followee_id)
+            self._record_feed_counters(pushes=pushes)
+        self._feed_cache.invalidate([follower_id])
         return {
             "success": True,
             "message": "Followed successfully"
         }
 
     def unfollow(self, follower_id: int, followee_id: int) -> dict:
-        for follower in self.followers:
-            if follower['follower_id'] == follower_id and follower['followee_id'] == followee_id:
-                self.followers.remove(follower)
-                return {
-                    "success": True,
-                    "message": "Unfollowed successfully"
-                }
+        if not self.following.get(follower_id, IdSet()).discard(followee_id):
+            return {
+                "success": False,
+                "message": "Follow relationship not found"
+            }
+        self.followers[followee_id].discard(follower_id)
+        if follower_id != followee_id:
+            if followee_id not in self._pull_authors:
+                self._prune_timeline(follower_id, followee_id)
+            self._record_feed_counters(pushes=self._update_fanout_mode(followee_id))
+        self._feed_cache.invalidate([follower_id])
         return {
-            "success": False,
-            "message": "Follow relationship not found"
+            "success": True,
+            "message": "Unfollowed successfully"
         }
 
 
@@ -503,10 +1116,15 @@ class DummyDatabase(Database):
             "caption": caption,
             "image_url": image_url,
             "location": location,
-            "type": "post"
+            "type": "post",
+            "timestamp": datetime.now().isoformat()
         }
         self._post_id += 1
         self.posts.append(post)
+        self._post_index[post["id"]] = post
+        self._record_feed_counters(pushes=self._publish_item(post))
+        self._search_indexer.enqueue(('post', post['id']))
+        self._invalidate_author_feeds(post['author_id'])
         return {
             "success": True,
             "message": "Post created successfully",
@@ -514,46 +1132,55 @@ class DummyDatabase(Database):
         }
 
     def delete_post(self, post_id: int) -> dict:
-        for post in self.posts:
-            if post['id'] == post_id:
-                self.posts.remove(post)
-                return {
-                    "success": True,
-                    "message": "Post deleted successfully"
-                }
+        post = self._post_index.pop(post_id, None)
+        if post is None:
+            return {
+                "success": False,
+                "message": "Post not found"
+            }
+        self.posts.remove(post)
+        self._unpublish_item(post)
+        self._search_indexer.enqueue(('post', post_id))
+        self._invalidate_author_feeds(post['author_id'])
         return {
-            "success": False,
-            "message": "Post not found"
+            "success": True,
+            "message": "Post deleted successfully"
         }
 
     def update_post(self, post_id: int, author_id: int, caption: str,
                     image_url: str, location: str | None = None) -> dict:
-        for post in self.posts:
-            if post['id'] == post_id:
-                post['author_id'] = author_id
-                post['caption'] = caption
-                post['image_url'] = image_url
-                post['location'] = location
-                return {
-                    "success": True,
-                    "message": "Post updated successfully"
-                }
+        post = self._post_index.get(post_id)
+        if post is None:
+            return {
+                "success": False,
+                "message": "Post not found"
+            }
+        if post['author_id'] != author_id:
+            self._invalidate_author_feeds(post['author_id'])
+            self._unpublish_item(post)
+            post['author_id'] = author_id
+            self._publish_item(post)
+        post['caption'] = caption
+        post['image_url'] = image_url
+        post['location'] = location
+        self._search_indexer.enqueue(('post', post_id))
+        self._invalidate_author_feeds(post['author_id'])
         return {
-            "success": False,
-            "message": "Post not found"
+            "success": True,
+            "message": "Post updated successfully"
         }
 
     def get_post(self, post_id: int) -> dict:
-        for post in self.posts:
-            if post['id'] == post_id:
-                return {
-                    "success": True,
-                    "message": "Post found",
-                    "data": post
-                }
+        post = self._post_index.get(post_id)
+        if post is None:
+            return {
+                "success": False,
+                "message": "Post not found"
+            }
         return {
-            "success": False,
-            "message": "Post not found"
+            "success": True,
+            "message": "Post found",
+            "data": post
         }
 
     # Events
@@ -567,10 +1194,16 @@ class DummyDatabase(Database):
             "start_time": start_time,
             "end_time": end_time,
             "location": location,
-            "type": "event"
+            "type": "event",
+            "timestamp": datetime.now().isoformat()
         }
         self._post_id += 1
         self.events.append(event)
+        self._event_index[event["id"]] = event
+        self._index_event_time(event)
+        self._search_indexer.enqueue(('event', event['id']))
+        self._record_feed_counters(pushes=self._publish_item(event))
+        self._invalidate_author_feeds(event['author_id'])
         return {
             "success": True,
             "message": "Event created successfully",
@@ -578,131 +1211,194 @@ class DummyDatabase(Database):
         }
 
     def delete_event(self, event_id: int) -> dict:
-        for event in self.events:
-            if event['id'] == event_id:
-                self.events.remove(event)
-                return {
-                    "success": True,
-                    "message": "Event deleted successfully"
-                }
+        event = self._event_index.pop(event_id, None)
+        if event is None:
+            return {
+                "success": False,
+                "message": "Event not found"
+            }
+        self.events.remove(event)
+        self._unpublish_item(event)
+        self._unindex_event_time(event)
+        self._search_indexer.enqueue(('event', event_id))
+        self._invalidate_author_feeds(event['author_id'])
         return {
-            "success": False,
-            "message": "Event not found"
+            "success": True,
+            "message": "Event deleted successfully"
         }
 
     def update_event(self, event_id: int, author_id: int, title: str, description: str,
                      start_time: str, end_time: str, location: str) -> dict:
-        for event in self.events:
-            if event['id'] == event_id:
-                event['author_id'] = author_id
-                event['title'] = title
-                event['description'] = description
-                event['start_time'] = start_time
-                event['end_time'] = end_time
-                event['location'] = location
-                return {
-                    "success": True,
-                    "message": "Event updated successfully"
-                }
+        event = self._event_index.get(event_id)
+        if event is None:
+            return {
+                "success": False,
+                "message": "Event not found"
+            }
+        if event['author_id'] != author_id:
+            self._invalidate_author_feeds(event['author_id'])
+            self._unpublish_item(event)
+            event['author_id'] = author_id
+            self._publish_item(event)
+        event['title'] = title
+        event['description'] = description
+        self._unindex_event_time(event)
+        event['start_time'] = start_time
+        event['end_time'] = end_time
+        self._index_event_time(event)
+        event['location'] = location
+        self._search_indexer.enqueue(('event', event_id))
+        self._invalidate_author_feeds(event['author_id'])
         return {
-            "success": False,
-            "message": "Event not found"
+            "success": True,
+            "message": "Event updated successfully"
         }
 
     def get_event(self, event_id: int) -> dict:
-        for event in self.events:
-            if event['id'] == event_id:
-                return {
-                    "success": True,
-                    "message": "Event found",
-                    "data": event
-                }
+        event = self._event_index.get(event_id)
+        if event is None:
+            return {
+                "success": False,
+                "message": "Event not found"
+            }
         return {
-            "success": False,
-            "message": "Event not found"
+            "success": True,
+            "message": "Event found",
+            "data": {
+                **event,
+                "going_count": len(self.going_events.get(event_id, ())),
+                "interested_count": len(self.interested_events.get(event_id, ()))
+            }
+        }
+
+    def get_upcoming_events(self, start_time: str | None = None, end_time: str | None = None,
+                            org_id: int | None = None, limit: int = 50) -> dict:
+        start = time() if start_time is None else timestamp_to_epoch(start_time)
+        end = start + UPCOMING_EVENTS_DEFAULT_RANGE if end_time is None else timestamp_to_epoch(end_time)
+        if not start or not end or end < start:
+            return {
+                "success": False,
+                "message": "Invalid time range"
+            }
+        authors = None if org_id is None else {org_id, *self._org_descendants.get(org_id, ())}
+        # Any event overlapping [start, end] starts within max_event_duration before start
+        low = bisect_left(self._event_starts, (start - self._max_event_duration,))
+        high = bisect_right(self._event_starts, (end, float('inf')))
+        events = []
+        for index in range(low, high):
+            if len(events) >= limit:
+                break
+            event_id = self._event_starts[index][1]
+            event = self._event_index[event_id]
+            if self._event_ends[event_id] < start or (authors is not None and event['author_id'] not in authors):
+                continue
+            events.append(event)
+        return {
+            "success": True,
+            "message": "Upcoming events retrieved successfully",
+            "data": events
         }
 
     # Events Going/Interested
     def going_event(self, event_id: int, user_id: int) -> dict:
-        for entry in self.interested_events:
-            if entry["event_id"] == event_id and entry["user_id"] == user_id:
-                return {
-                    "success": True,
-                    "message": "User already marked as interested in the event"
-                }
-        for entry in self.going_events:
-            if entry["event_id"] == event_id and entry["user_id"] == user_id:
-                return {
-                    "success": True,
-                    "message": "User already marked as going to the event"
-                }
-        self.going_events.append({
-            "event_id": event_id,
-            "user_id": user_id
-        })
+        if user_id in self.interested_events.get(event_id, ()):
+            return {
+                "success": True,
+                "message": "User already marked as interested in the event"
+            }
+        if not self.going_events.setdefault(event_id, IdSet()).add(user_id):
+            return {
+                "success": True,
+                "message": "User already marked as going to the event"
+            }
+        self._refresh_item_signals(event_id)
+        self._invalidate_item_feeds(event_id)
         return {
             "success": True,
             "message": "User marked as going to the event"
         }
 
     def remove_going_event(self, event_id: int, user_id: int) -> dict:
-        for entry in self.going_events:
-            if entry["event_id"] == event_id and entry["user_id"] == user_id:
-                self.going_events.remove(entry)
-                return {
-                    "success": True,
-                    "message": "User removed from going to the event"
-                }
+        if self.going_events.get(event_id, IdSet()).discard(user_id):
+            self._refresh_item_signals(event_id)
+            self._invalidate_item_feeds(event_id)
+            return {
+                "success": True,
+                "message": "User removed from going to the event"
+            }
         return {
             "success": True,
             "message": "User not marked as going to the event"
         }
 
     def interested_event(self, event_id: int, user_id: int) -> dict:
-        for entry in self.going_events:
-            if entry["event_id"] == event_id and entry["user_id"] == user_id:
-                return {
-                    "success": True,
-                    "message": "User already marked as going to the event"
-                }
-        for entry in self.interested_events:
-            if entry["event_id"] == event_id and entry["user_id"] == user_id:
-                return {
-                    "success": True,
-                    "message": "User already marked as interested in the event"
-                }
-        self.interested_events.append({
-            "event_id": event_id,
-            "user_id": user_id
-        })
+        if user_id in self.going_events.get(event_id, ()):
+            return {
+                "success": True,
+                "message": "User already marked as going to the event"
+            }
+        if not self.interested_events.setdefault(event_id, IdSet()).add(user_id):
+            return {
+                "success": True,
+                "message": "User already marked as interested in the event"
+            }
+        self._refresh_item_signals(event_id)
+        self._invalidate_item_feeds(event_id)
         return {
             "success": True,
             "message": "User marked as interested in the event"
         }
 
     def remove_interested_event(self, event_id: int, user_id: int) -> dict:
-        for entry in self.interested_events:
-            if entry["event_id"] == event_id and entry["user_id"] == user_id:
-                self.interested_events.remove(entry)
-                return {
-                    "success": True,
-                    "message": "User removed from interested in the event"
-                }
+        if self.interested_events.get(event_id, IdSet()).discard(user_id):
+            self._refresh_item_signals(event_id)
+            self._invalidate_item_feeds(event_id)
+            return {
+                "success": True,
+                "message": "User removed from interested in the event"
+            }
         return {
             "success": True,
             "message": "User not marked as interested in the event"
         }
 
+    def get_event_attendees(self, event_id: int, status: str = "going", offset: int = 0, limit: int = 50) -> dict:
+        if event_id not in self._event_index:
+            return {
+                "success": False,
+                "message": "Event not found"
+            }
+        if status not in ("going", "interested"):
+            return {
+                "success": False,
+                "message": "Invalid status, expected 'going' or 'interested'"
+            }
+        user_ids = (self.going_events if status == "going" else self.interested_events).get(event_id, IdSet())
+        offset = max(offset, 0)
+        page = user_ids[offset:offset + max(limit, 0)]
+        names = self._get_user_name_pfps(page)
+        return {
+            "success": True,
+            "message": "Event attendees retrieved successfully",
+            "data": [{"user_id": user_id, "username": names[user_id][0], "pfp_url": names[user_id][1]}
+                     for user_id in page],
+            "count": len(user_ids)
+        }
+
     # Post/Event Comments
     def create_comment(self, post_id: int, parent_id: int, author_id: int, content: str) -> dict:
         comment = {
-            "id": len(self.comments) + 1,
+            "id": self._comment_id,
             "post_id": post_id,
             "parent_id": parent_id,
             "author_id": author_id,
             "content": content
         }
-        self.comments = [comment] + self.comments
+        self._comment_id += 1
+        self.comments.append(comment)
+        self._comment_index[comment["id"]] = comment
+        self._add_comment_to_tree(comment)
+        self._invalidate_item_feeds(post_id)
         return {
             "success": True,
             "message": "Comment created successfully",
@@ -711,155 +1407,133 @@ class DummyDatabase(Database):
         }
 
     def delete_comment(self, comment_id: int) -> dict:
-        for comment in self.comments:
-            if comment["id"] == comment_id:
-                self.comments.remove(comment)
-                return {
-                    "success": True,
-                    "message": "Comment deleted successfully"
-                }
+        comment = self._comment_index.pop(comment_id, None)
+        if comment is None:
+            return {
+                "success": False,
+                "message": "Comment not found"
+            }
+        self.comments.remove(comment)
+        self._remove_comment_from_tree(comment)
+        self._invalidate_item_feeds(comment['post_id'])
         return {
-            "success": False,
-            "message": "Comment not found"
+            "success": True,
+            "message": "Comment deleted successfully"
         }
 
     def update_comment(self, comment_id: int, content: str) -> dict:
-        for comment in self.comments:
-            if comment["id"] == comment_id:
-                comment["content"] = content
-                return {
-                    "success": True,
-                    "message": "Comment updated successfully"
-                }
+        comment = self._comment_index.get(comment_id)
+        if comment is None:
+            return {
+                "success": False,
+                "message": "Comment not found"
+            }
+        comment["content"] = content
+        self._invalidate_item_feeds(comment['post_id'])
         return {
-            "success": False,
-            "message": "Comment not found"
+            "success": True,
+            "message": "Comment updated successfully"
         }
 
     def get_comment(self, comment_id: int) -> dict:
-        for comment in self.comments:
-            if comment["id"] == comment_id:
-                comment['author_name'], comment['author_pfp'] = self._get_user_name_pfp(comment['author_id'])
-                like_user_ids = [x['user_id'] for x in self.likes if x['post_id'] == comment['post_id']]
-                dislike_user_ids = [x['user_id'] for x in self.dislikes if x['post_id'] == comment['post_id']]
-                comment['like_count'] = len(like_user_ids)
-                comment['dislike_count'] = len(dislike_user_ids)
-                comment['user_liked'] = comment['author_id'] in like_user_ids
-                comment['user_disliked'] = comment['author_id'] in dislike_user_ids
-                comment['reply_count'] = len([x for x in self.comments if x['parent_id'] == comment['id']])
-                return {
-                    "success": True,
-                    "data": comment
-                }
+        comment = self._comment_index.get(comment_id)
+        if comment is None:
+            return {
+                "success": False,
+                "message": "Comment not found"
+            }
         return {
-            "success": False,
-            "message": "Comment not found"
+            "success": True,
+            "data": self._serialize_comments(self._build_comment_payloads([comment]), comment['author_id'])[0]
         }
 
     # Posts Like/Dislike
     def like(self, post_id: int, user_id: int) -> dict:
-        for entry in self.dislikes:
-            if entry["post_id"] == post_id and entry["user_id"] == user_id:
-                return {
-                    "success": True,
-                    "message": "User already disliked the post"
-                }
-        for entry in self.likes:
-            if entry["post_id"] == post_id and entry["user_id"] == user_id:
-                return {
-                    "success": True,
-                    "message": "User already liked the post"
-                }
-        self.likes.append({
-            "post_id": post_id,
-            "user_id": user_id
-        })
+        if user_id in self.dislikes.get(post_id, ()):
+            return {
+                "success": True,
+                "message": "User already disliked the post"
+            }
+        if not self.likes.setdefault(post_id, IdSet()).add(user_id):
+            return {
+                "success": True,
+                "message": "User already liked the post"
+            }
+        self._refresh_item_signals(post_id)
+        self._invalidate_item_feeds(post_id)
         return {
             "success": True,
             "message": "User liked the post"
         }
 
     def remove_like(self, post_id: int, user_id: int) -> dict:
-        for entry in self.likes:
-            if entry["post_id"] == post_id and entry["user_id"] == user_id:
-                self.likes.remove(entry)
-                return {
-                    "success": True,
-                    "message": "User removed like from the post"
-                }
+        if not self.likes.get(post_id, IdSet()).discard(user_id):
+            return {
+                "success": True,
+                "message": "User not liked the post"
+            }
+        self._refresh_item_signals(post_id)
+        self._invalidate_item_feeds(post_id)
         return {
             "success": True,
-            "message": "User not liked the post"
+            "message": "User removed like from the post"
         }
 
     def dislike(self, post_id: int, user_id: int) -> dict:
-        for entry in self.likes:
-            if entry["post_id"] == post_id and entry["user_id"] == user_id:
-                return {
-                    "success": True,
-                    "message": "User already liked the post"
-                }
-        for entry in self.dislikes:
-            if entry["post_id"] == post_id and entry["user_id"] == user_id:
-                return {
-                    "success": True,
-                    "message": "User already disliked the post"
-                }
-        self.dislikes.append({
-            "post_id": post_id,
-            "user_id": user_id
-        })
+        if user_id in self.likes.get(post_id, ()):
+            return {
+                "success": True,
+                "message": "User already liked the post"
+            }
+        if not self.dislikes.setdefault(post_id, IdSet()).add(user_id):
+            return {
+                "success": True,
+                "message": "User already disliked the post"
+            }
+        self._refresh_item_signals(post_id)
+        self._invalidate_item_feeds(post_id)
         return {
             "success": True,
             "message": "User disliked the post"
         }
 
     def remove_dislike(self, post_id: int, user_id: int) -> dict:
-        for entry in self.dislikes:
-            if entry["post_id"] == post_id and entry["user_id"] == user_id:
-                self.dislikes.remove(entry)
-                return {
-                    "success": True,
-                    "message": "User removed dislike from the post"
-                }
+        if not self.dislikes.get(post_id, IdSet()).discard(user_id):
+            return {
+                "success": True,
+                "message": "User not disliked the post"
+            }
+        self._refresh_item_signals(post_id)
+        self._invalidate_item_feeds(post_id)
         return {
             "success": True,
-            "message": "User not disliked the post"
+            "message": "User removed dislike from the post"
         }
     
     # Post/Event Feed
     def _get_user_name_pfp(self, user_id: int) -> tuple[str, str]:
         """ Returns username and profile picture url - INTERNAL USE ONLY """
-        for user in self.users:
-            if user['id'] == user_id:
-                return user['username'], user.get('pfp_url', '')
-        return "Unknown User", ""
+        user = self._user_index.get(user_id)
+        if user is None:
+            return "Unknown User", ""
+        return user['username'], user.get('pfp_url', '')
     
     def get_user_name(self, user_id:int):
-        for user in self.users:
-            if user['id'] == user_id:
-                return {
-                    "success": True,
-                    "message": "Successfully fetched user name",
-                    "data": user["username"]
-                }
+        user = self._user_index.get(user_id)
+        if user is None:
+            return {
+                "success": False,
+                "message": "Failed to fetch user name - id does not exist"
+            }
         return {
-            "success": False,
-            "message": "Failed to fetch user name - id does not exist"
+            "success": True,
+            "message": "Successfully fetched user name",
+            "data": user["username"]
         }
     
     def get_comments(self, user_id: int, post_id: int, offset: int = 0, limit: int = 10) -> dict:
-        comments = [comment for comment in self.comments if comment['post_id'] == post_id and comment['parent_id'] == 0]
-        comments = comments[offset:offset + limit]
-        for comment in comments:
-            comment['author_name'], comment['author_pfp'] = self._get_user_name_pfp(comment['author_id'])
-            like_user_ids = [x['user_id'] for x in self.likes if x['post_id'] == post_id]
-            dislike_user_ids = [x['user_id'] for x in self.dislikes if x['post_id'] == post_id]
-            comment['like_count'] = len(like_user_ids)
-            comment['dislike_count'] = len(dislike_user_ids)
-            comment['user_liked'] = user_id in like_user_ids
-            comment['user_disliked'] = user_id in dislike_user_ids
-            comment['reply_count'] = len([x for x in self.comments if x['parent_id'] == comment['id']])
+        comments = self._get_comment_page(self._post_comments.get(post_id, []), offset, limit)
+        comments = self._serialize_comments(self._build_comment_payloads(comments), user_id)
         return {
             "success": True,
             "message": "Comments retrieved successfully",
@@ -867,63 +1541,105 @@ class DummyDatabase(Database):
         }
     
     def get_replies(self, user_id: int, comment_id: int, offset: int = 0, limit: int = 10) -> dict:
-        replies = [reply for reply in self.comments if reply['parent_id'] == comment_id]
-        replies = replies[offset:offset + limit]
-        for reply in replies:
-            reply['author_name'], reply['author_pfp'] = self._get_user_name_pfp(reply['author_id'])
-            like_user_ids = [x['user_id'] for x in self.likes if x['post_id'] == reply['post_id']]
-            dislike_user_ids = [x['user_id'] for x in self.dislikes if x['post_id'] == reply['post_id']]
-            reply['like_count'] = len(like_user_ids)
-            reply['dislike_count'] = len(dislike_user_ids)
-            reply['user_liked'] = user_id in like_user_ids
-            reply['user_disliked'] = user_id in dislike_user_ids
-            reply['reply_count'] = len([x for x in self.comments if x['parent_id'] == reply['id']])
+        replies = self._get_comment_page(self._comment_replies.get(comment_id, []), offset, limit)
+        replies = self._serialize_comments(self._build_comment_payloads(replies), user_id)
         return {
             "success": True,
             "message": "Replies retrieved successfully",
             "data": replies
         }
 
-    def get_user_feed(self, user_id: int, offset: int = 0, limit: int = 10) -> dict:
-        feed = (self.posts + self.events)[offset:offset + limit]
-        for item in feed:
-            item['author_name'], item['author_pfp'] = self._get_user_name_pfp(item['author_id'])
-            like_user_ids = [x['user_id'] for x in self.likes if x['post_id'] == item['id']]
-            dislike_user_ids = [x['user_id'] for x in self.dislikes if x['post_id'] == item['id']]
-            item['like_count'] = len(like_user_ids)
-            item['dislike_count'] = len(dislike_user_ids)
-            item['user_liked'] = user_id in like_user_ids
-            item['user_disliked'] = user_id in dislike_user_ids
-            item['comment_count'] = len([x for x in self.comments if x['post_id'] == item['id'] and x['parent_id'] == 0])
-            item['comments'] = self.get_comments(user_id, item['id'], 0, 2)['data'] if item['type'] == 'post' else []
-            if item['type'] == 'event':
-                going_user_ids = [x['user_id'] for x in self.going_events if x['event_id'] == item['id']]
-                interested_user_ids = [x['user_id'] for x in self.interested_events if x['event_id'] == item['id']]
-                item['going_count'] = len(going_user_ids)
-                item['interested_count'] = len(interested_user_ids)
-                item['user_going'] = user_id in going_user_ids
-                item['user_interested'] = user_id in interested_user_ids
+    def get_feed_cache_stats(self) -> dict:
+        ''' Returns hit/miss/eviction counts and the size of the feed page cache '''
+        return {
+            "success": True,
+            "message": "Feed cache stats retrieved successfully",
+            "data": self._feed_cache.stats()
+        }
+
+    def set_fanout_threshold(self, fanout_threshold: int) -> dict:
+        ''' Changes the follower count at which authors switch from push to pull, and rebuilds the timelines '''
+        self.fanout_threshold = fanout_threshold
+        self._build_timelines()
+        return {
+            "success": True,
+            "message": "Fan-out threshold updated successfully"
+        }
+
+    def get_user_feed(self, user_id: int, offset: int = 0, limit: int = 10,
+                      cursor: str | None = None, rank: str = "recent") -> dict:
+        key = (user_id, offset, limit, cursor, rank)
+        result = self._feed_cache.get(key)
+        if result is not None:
+            self._record_feed_counters()
+            return result
+        result = self._build_user_feed(user_id, offset, limit, cursor, rank)
+        if result["success"]:
+            self._feed_cache.put(key, user_id, result, RANKED_FEED_CACHE_TTL if rank == "top" else None)
+        return result
+
+    def _build_user_feed(self, user_id: int, offset: int, limit: int, cursor: str | None, rank: str) -> dict:
+        ''' Builds a page of a user's feed, see get_user_feed - INTERNAL USE ONLY '''
+        if rank not in ("recent", "top"):
+            return {
+                "success": False,
+                "message": "Invalid rank, expected 'recent' or 'top'"
+            }
+        before_key = None
+        if cursor is not None:
+            try:
+                before_key = decode_cursor(cursor)
+            except ValueError:
+                return {
+                    "success": False,
+                    "message": "Invalid cursor"
+                }
+        timeline = self._timelines.get(user_id, [])
+        pulled = [self._author_items.get(author_id, []) for author_id in self.following.get(user_id, ())
+                  if author_id in self._pull_authors and author_id != user_id]
+        # Seek each source to the items older than the cursor
+        sources = [(keys, len(keys) if before_key is None else bisect_left(keys, before_key))
+                   for keys in [timeline, *pulled]]
+        if rank == "top":
+            # Score the newest rank_window candidates and page through them in score order
+            keys = merge(*(_iter_newest_first(keys, end) for keys, end in sources), reverse=True)
+            ranked = self._rank_feed_keys(list(islice(keys, self.rank_window)))
+            page = ranked[max(offset, 0):max(offset, 0) + max(limit, 0)]
+        elif pulled:
+            # Merge the pushed timeline with the pull authors' items, newest first
+            keys = merge(*(_iter_newest_first(keys, end) for keys, end in sources), reverse=True)
+            page = list(islice(keys, max(offset, 0), max(offset, 0) + max(limit, 0)))
+        else:
+            end = max(sources[0][1] - offset, 0)
+            page = list(reversed(timeline[max(end - limit, 0):end]))
+        self._record_feed_counters(pulls=len(pulled))
+        payloads = self._build_feed_payloads([self._get_feed_item(item_id) for _, item_id in page])
+        feed = self._serialize_feed(payloads, user_id)
         return {
             "success": True,
             "message": "User feed retrieved successfully",
-            "data": feed
+            "data": feed,
+            # Ranked pages are not in key order, they are paged with offset within the window
+            "next_cursor": encode_cursor(*page[-1]) if rank == "recent" and page and len(page) == limit else None
         }
     
     # Messaging
     def get_chats(self, user_id: int) -> dict:
-        chats = [chat for chat in self.chats if user_id in [member['user_id'] for member in self.chat_members if member['chat_id'] == chat['id']]]
-        group_chats = [chat for chat in self.group_chats if user_id in [member['user_id'] for member in self.chat_members if member['chat_id'] == chat['id']]]
+        chat_ids = sorted(self._user_chats.get(user_id, ()))
+        # Per-viewer fields go on copies, the stored chats are shared by all members
+        chats = [dict(self._chat_index[chat_id]) for chat_id in chat_ids if chat_id not in self._group_chat_ids]
+        group_chats = [dict(self._chat_index[chat_id]) for chat_id in chat_ids if chat_id in self._group_chat_ids]
         
         for chat in chats:
-            other_user_id = [member['user_id'] for member in self.chat_members if member['chat_id'] == chat['id'] and member['user_id'] != user_id][0]
+            other_user_id = next((member_id for member_id in self._chat_member_index[chat['id']] if member_id != user_id), 0)
             other_user_name, other_user_pfp = self._get_user_name_pfp(other_user_id)
             chat['other_name'] = other_user_name
             chat['other_pfp'] = other_user_pfp
-            chat['unread_count'] = len([msg for msg in self.messages if msg['chat_id'] == chat['id'] and msg['sender_id'] != user_id and msg['id'] not in [mr['message_id'] for mr in self.message_read if mr['user_id'] == user_id]])
+            chat['unread_count'] = self._unread_counts.get((chat['id'], user_id), 0)
             chat['type'] = 'dm'
         for group_chat in group_chats:
             group_chat['type'] = 'group'
-            group_chat['unread_count'] = len([msg for msg in self.messages if msg['chat_id'] == group_chat['id'] and msg['sender_id'] != user_id and msg['id'] not in [mr['message_id'] for mr in self.message_read if mr['user_id'] == user_id]])
+            group_chat['unread_count'] = self._unread_counts.get((group_chat['id'], user_id), 0)
 
         return {
             "success": True,
@@ -931,9 +1647,17 @@ class DummyDatabase(Database):
             "data": chats + group_chats
         }
 
-    def get_chat_messages(self, chat_id: int, offset: int = 0, limit: int = 10) -> dict:
-        messages = [msg for msg in self.messages if msg['chat_id'] == chat_id]
-        messages = messages[offset:offset + limit]
+    def get_chat_messages(self, chat_id: int, offset: int = 0, limit: int = 10,
+                          before_id: int | None = None, after_id: int | None = None) -> dict:
+        chat_log = self.messages.get(chat_id, [])
+        if after_id is not None:
+            start = bisect_right(chat_log, after_id, key=_get_id)
+            messages = chat_log[start:start + limit]
+        elif before_id is not None:
+            end = bisect_left(chat_log, before_id, key=_get_id)
+            messages = chat_log[max(end - limit, 0):end]
+        else:
+            messages = chat_log[offset:offset + limit]
         for message in messages:
             message['author_name'], message['author_pfp'] = self._get_user_name_pfp(message['sender_id'])
         return {
@@ -943,19 +1667,14 @@ class DummyDatabase(Database):
         }
 
     def create_chat(self, members: dict) -> dict:
-        self.chats.append({
+        chat = {
             "id": self._chat_id,
             "created_at": datetime.now().isoformat()
-        })
+        }
+        self.chats.append(chat)
+        self._chat_index[chat["id"]] = chat
         for member in members:
-            self.chat_members.append({
-                "id": len(self.chat_members) + 1,
-                "chat_id": self._chat_id,
-                "user_id": member['user_id'],
-                "joined_at": datetime.now().isoformat(),
-                "is_org": member['is_org'],
-                "role": member['role']
-            })
+            self._add_chat_member(self._chat_id, member)
         data = {
             "id": self._chat_id,
             "created_at": datetime.now().isoformat(),
@@ -971,21 +1690,17 @@ class DummyDatabase(Database):
         }
 
     def create_group_chat(self, members: dict, name: str, image_url: str) -> dict:
-        self.group_chats.append({
+        group_chat = {
             "id": self._chat_id,
             "name": name,
             "image_url": image_url,
             "created_at": datetime.now().isoformat()
-        })
+        }
+        self.group_chats.append(group_chat)
+        self._chat_index[group_chat["id"]] = group_chat
+        self._group_chat_ids.add(group_chat["id"])
         for member in members:
-            self.chat_members.append({
-                "id": len(self.chat_members) + 1,
-                "chat_id": self._chat_id,
-                "user_id": member['user_id'],
-                "joined_at": datetime.now().isoformat(),
-                "is_org": member['is_org'],
-                "role": member['role']
-            })
+            self._add_chat_member(self._chat_id, member)
         data = {
             "id": self._chat_id,
             "created_at": datetime.now().isoformat(),
@@ -1001,42 +1716,70 @@ class DummyDatabase(Database):
             "data": data
         }
 
-    def add_group_chat_member(self, chat_id: int, member: dict) -> dict:
-        self.chat_members.append({
-            "id": len(self.chat_members) + 1,
+    def _add_chat_member(self, chat_id: int, member: dict) -> bool:
+        ''' Adds a member to a chat, returns False if already a member - INTERNAL USE ONLY '''
+        chat_members = self._chat_member_index.setdefault(chat_id, {})
+        if member['user_id'] in chat_members:
+            return False
+        row = {
+            "id": self._chat_member_id,
             "chat_id": chat_id,
             "user_id": member['user_id'],
             "joined_at": datetime.now().isoformat(),
             "is_org": member['is_org'],
             "role": member['role']
-        })
+        }
+        self._chat_member_id += 1
+        self.chat_members[row['id']] = row
+        chat_members[member['user_id']] = row
+        self._user_chats.setdefault(member['user_id'], set()).add(chat_id)
+        # New members start with the existing history already read
+        chat_log = self.messages.get(chat_id)
+        self.message_read[(chat_id, member['user_id'])] = chat_log[-1]['id'] if chat_log else 0
+        self._unread_counts[(chat_id, member['user_id'])] = 0
+        return True
+
+    def add_group_chat_member(self, chat_id: int, member: dict) -> dict:
+        if not self._add_chat_member(chat_id, member):
+            return {
+                "success": True,
+                "message": "Member already in group chat"
+            }
         return {
             "success": True,
             "message": "Member added to group chat successfully"
         }
 
     def remove_group_chat_member(self, chat_id: int, member_id: int) -> dict:
-        for member in self.chat_members:
-            if member['chat_id'] == chat_id and member['user_id'] == member_id:
-                self.chat_members.remove(member)
-                return {
-                    "success": True,
-                    "message": "Member removed from group chat successfully"
-                }
+        member = self._chat_member_index.get(chat_id, {}).pop(member_id, None)
+        if member is None:
+            return {
+                "success": False,
+                "message": "Member not found in group chat"
+            }
+        del self.chat_members[member['id']]
+        self._user_chats[member_id].discard(chat_id)
+        self.message_read.pop((chat_id, member_id), None)
+        self._unread_counts.pop((chat_id, member_id), None)
         return {
-            "success": False,
-            "message": "Member not found in group chat"
+            "success": True,
+            "message": "Member removed from group chat successfully"
         }
 
     def create_chat_message(self, chat_id: int, sender_id: int, content: str) -> dict:
         message = {
-            "id": len(self.messages) + 1,
+            "id": self._message_id,
             "chat_id": chat_id,
             "sender_id": sender_id,
             "content": content,
             "created_at": datetime.now().isoformat()
         }
-        self.messages.append(message)
+        self._message_id += 1
+        self.messages.setdefault(chat_id, []).append(message)
+        self._message_index[message["id"]] = message
+        for member_id in self._chat_member_index.get(chat_id, {}):
+            if member_id != sender_id:
+                self._unread_counts[(chat_id, member_id)] = self._unread_counts.get((chat_id, member_id), 0) + 1
         message['author_name'], message['author_pfp'] = self._get_user_name_pfp(sender_id)
         return {
             "success": True,
@@ -1045,104 +1788,205 @@ class DummyDatabase(Database):
         }
 
     def delete_chat_message(self, chat_id: int, message_id: int) -> dict:
-        for message in self.messages:
-            if message['chat_id'] == chat_id and message['id'] == message_id:
-                self.messages.remove(message)
-                return {
-                    "success": True,
-                    "message": "Message deleted successfully"
-                }
+        message = self._message_index.get(message_id)
+        if message is None or message['chat_id'] != chat_id:
+            return {
+                "success": False,
+                "message": "Message not found in chat"
+            }
+        del self._message_index[message_id]
+        chat_log = self.messages[chat_id]
+        del chat_log[bisect_left(chat_log, message_id, key=_get_id)]
+        for member_id in self._chat_member_index.get(chat_id, {}):
+            if member_id != message['sender_id'] and self.message_read.get((chat_id, member_id), 0) < message_id:
+                self._unread_counts[(chat_id, member_id)] -= 1
         return {
-            "success": False,
-            "message": "Message not found in chat"
+            "success": True,
+            "message": "Message deleted successfully"
         }
 
     def read_chat_message(self, chat_id: int, message_id: int, user_id: int) -> dict:
-        self.message_read.append({
-            "chat_id": chat_id,
-            "message_id": message_id,
-            "user_id": user_id
-        })
+        # Reading a message marks everything up to it as read
+        watermark = self.message_read.get((chat_id, user_id), 0)
+        if message_id > watermark:
+            newly_read = self._count_messages_from_others(chat_id, user_id, watermark, message_id)
+            unread_count = self._unread_counts.get((chat_id, user_id), 0)
+            self._unread_counts[(chat_id, user_id)] = max(unread_count - newly_read, 0)
+            self.message_read[(chat_id, user_id)] = message_id
         return {
             "success": True,
             "message": "Message marked as read successfully"
         }
 
     def react_to_chat_message(self, chat_id: int, message_id: int, user_id: int, reaction: str) -> dict:
-        self.message_reactions.append({
-            "chat_id": chat_id,
-            "message_id": message_id,
-            "user_id": user_id,
-            "reaction": reaction
-        })
+        message_reaction = MessageReaction(self._reaction_id, chat_id, message_id, user_id, reaction,
+                                           datetime.now().isoformat())
+        self.message_reactions[message_reaction.id] = message_reaction
+        self._reaction_id += 1
         return {
             "success": True,
-            "message": "Message reacted to successfully"
+            "message": "Message reacted to successfully",
+            "data": message_reaction.to_dict()
         }
 
     def remove_chat_message_reaction(self, chat_id: int, message_id: int, user_id: int, reaction_id: int) -> dict:
-        print("DATABSE removing reaction", chat_id, message_id, user_id, reaction_id)
-        for reaction in self.message_reactions:
-            if reaction['chat_id'] == chat_id and reaction['message_id'] == message_id and reaction['user_id'] == user_id and reaction['id'] == reaction_id:
-                print("FOUND")
-                self.message_reactions.remove(reaction)
-                print("SUCCESS")
-                return {
-                    "success": True,
-                    "message": "Message reaction removed successfully"
-                }
+        reaction = self.message_reactions.get(reaction_id)
+        if reaction and reaction.chat_id == chat_id and reaction.message_id == message_id and reaction.user_id == user_id:
+            del self.message_reactions[reaction_id]
+            return {
+                "success": True,
+                "message": "Message reaction removed successfully"
+            }
         return {
             "success": False,
             "message": "Message reaction not found"
         }
 
     # Search
-    def search(self, query: str, include_posts: bool, include_events: bool,
-               include_organizations: bool, include_users: bool) -> dict:
-        results = []
-
-        if include_users:
-            for user in self.users:
-                user['type'] = 'user'
-                results.append(user)
-        if include_organizations:
-            for org in self.organizations:
-                org['type'] = 'organization'
-                results.append(org)
-        if include_events:
-            for event in self.events:
-                event['type'] = 'event'
-                results.append(event)
-        if include_posts:
-            for post in self.posts:
-                post['type'] = 'post'
-                results.append(post)
-
-        import random
-        random.shuffle(results)
+    def _get_search_scores(self, matches: dict[tuple[str, int], float], now: float) -> dict[tuple[str, int], float]:
+        ''' Boosts the text relevance of posts and events that are recent as of now - INTERNAL USE ONLY '''
+        scores = {}
+        for key, score in matches.items():
+            if key[1] not in self._get_search_table(key[0]):
+                continue # deleted, the indexer has not caught up yet
+            if key[0] in ('post', 'event'):
+                age = max(now - self._item_epochs.get(key[1], 0.0), 0.0)
+                score *= 1.0 + SEARCH_RECENCY_BOOST * 0.5 ** (age / SEARCH_RECENCY_HALF_LIFE)
+            scores[key] = score
+        return scores
 
+    def search(self, query: str, include_posts: bool, include_events: bool,
+               include_organizations: bool, include_users: bool,
+               limit: int = 20, cursor: str | None = None) -> dict:
+        doc_types = {doc_type for doc_type, included in [('user', include_users),
+                                                          ('organization', include_organizations),
+                                                          ('event', include_events),
+                                                          ('post', include_posts)] if included}
+        as_of = time()
+        after = None
+        if cursor is not None:
+            try:
+                # Later pages keep the first page's clock, so recency boosts and the cursor's score agree
+                as_of, score, doc_type, doc_id = decode_score_cursor(cursor)
+                after = (-score, SEARCH_TYPE_ORDER[doc_type], doc_id)
+            except (ValueError, KeyError):
+                return {
+                    "success": False,
+                    "message": "Invalid cursor"
+                }
+        with self._search_indexer.lock:
+            matches = self._search_index.search(query, doc_types)
+        scores = self._get_search_scores(matches, as_of)
+        counts = dict.fromkeys(sorted(doc_types, key=SEARCH_TYPE_ORDER.get), 0)
+        for doc_type, _ in scores:
+            counts[doc_type] += 1
+
+        # Best score first, ties by type then id, so every result has a distinct position to seek past
+        def rank_key(key: tuple[str, int]) -> tuple[float, int, int]:
+            return (-scores[key], SEARCH_TYPE_ORDER[key[0]], key[1])
+
+        candidates = scores.keys()
+        if after is not None:
+            candidates = (key for key in candidates if rank_key(key) > after)
+        # Bounded heap, one more than a page to know whether another page follows
+        page = nsmallest(limit + 1, candidates, key=rank_key)
+        has_more = len(page) > limit
+        page = page[:limit]
+        last = page[-1] if page and has_more else None
         return {
             "success": True,
             "message": "Search completed",
-            "data": results
+            "data": [{**self._get_search_result(*key), "score": scores[key]} for key in page],
+            "counts": counts,
+            "next_cursor": encode_score_cursor(as_of, scores[last], *last) if last else None
         }
 
     def search_organizations(self, query: str) -> dict:
-        results = [org for org in self.organizations if org.get('parent_id') == 0 and query.lower() in org.get("name", "").lower()]
+        with self._search_indexer.lock:
+            org_ids = self._org_typeahead.search(query)
+        results = [org for org in map(self._organization_index.get, org_ids)
+                   if org is not None and org.get('parent_id') == 0]
         return {
             "success": True,
             "message": "Organizations search completed",
             "data": results
         }
 
+    def typeahead_organizations(self, query: str, limit: int = 10) -> dict:
+        with self._search_indexer.lock:
+            org_ids = self._org_typeahead.search(query, limit)
+        # Deletes and parent changes may not have reached the typeahead index yet
+        orgs = [org for org in map(self._organization_index.get, org_ids)
+                if org is not None and org.get('parent_id') == 0]
+        # Suggestions only carry what the dropdown renders, to keep per-keystroke responses small
+        results = [{
+            "id": org['id'],
+            "name": org.get('name'),
+            "location": org.get('location'),
+            "pfp_url": org.get('pfp_url')
+        } for org in orgs]
+        return {
+            "success": True,
+            "message": "Organization suggestions retrieved successfully",
+            "data": results
+        }
+
     def search_events(self, query: str) -> dict:
-        results = [event for event in self.events if query.lower() in event.get("name", "").lower()]
+        with self._search_indexer.lock:
+            matches = self._search_index.search(query, {'event'})
+        results = [self._event_index[event_id] for _, event_id in sorted(matches) if event_id in self._event_index]
         return {
             "success": True,
             "message": "Events search completed",
             "data": results
         }
 
+    def rebuild_search_index(self) -> dict:
+        ''' Rebuilds the search indexes from every record in one pass, used on cold start '''
+        with self._search_indexer.lock:
+            self._search_index = InvertedIndex()
+            for user in self.users:
+                self._index_user_text(user)
+            for org in self.organizations:
+                self._index_organization_text(org)
+            for item in self.posts + self.events:
+                self._index_item_text(item)
+            # Bulk-built with one sort rather than an insertion per name
+            self._org_typeahead = PrefixIndex((org['id'], org.get('name')) for org in self.organizations
+                                              if org.get('parent_id') == 0)
+        return {
+            "success": True,
+            "message": "Search index rebuilt successfully"
+        }
+
+    def close(self) -> dict:
+        ''' Stops the background search indexer once its pending changes are applied '''
+        self._search_indexer.close()
+        return {
+            "success": True,
+            "message": "Database closed successfully"
+        }
+
+    def flush_search_index(self, timeout: float | None = None) -> dict:
+        ''' Waits until every write so far is searchable, for tests and read-your-writes callers '''
+        if not self._search_indexer.flush(timeout):
+            return {
+                "success": False,
+                "message": "Timed out waiting for the search indexer"
+            }
+        return {
+            "success": True,
+            "message": "Search index is up to date"
+        }
+
+    def get_search_indexer_stats(self) -> dict:
+        ''' Returns the search indexer's queue depth, lag and batch counts '''
+        return {
+            "success": True,
+            "message": "Search indexer stats retrieved successfully",
+            "data": self._search_indexer.stats()
+        }
+
     def create_user_feedback(self, first_name: str, last_name: str, email: str, feedback: str) -> dict:
         self.feedback.append({
             "first_name": first_name,
@@ -0,0 +1,125 @@
+'''
+Background search indexing for DummyDatabase
+'''
+
+from collections.abc import Callable, Hashable
+import logging
+import queue
+import threading
+from time import monotonic
+import weakref
+
+logger = logging.getLogger(__name__)
+
+_STOP = object() # queued by close(), tells the worker to exit
+
+class SearchIndexer:
+    ''' Applies search index changes on a worker thread, in batches.
+
+        Write methods enqueue the key of each changed document and return straight away.
+        The worker drains up to batch_size keys at a time, drops repeated keys, and hands
+        the batch to apply_batch while holding lock, which readers of the indexes take too.
+        The queue is bounded, so a worker that falls behind blocks writers instead of
+        letting the lag grow without limit.
+
+        apply_batch must be a bound method. The worker only keeps a weak reference to it,
+        so the owning object can still be garbage collected, which stops the worker.
+    '''
+    def __init__(self, apply_batch: Callable[[list[Hashable]], None], batch_size: int = 256,
+                 max_pending: int = 10000):
+        self.lock = threading.Lock() # held while a batch is applied, readers take it to see consistent indexes
+        self._apply_batch = weakref.WeakMethod(apply_batch)
+        self._batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(max_pending) # (enqueue time, key)
+        self._progress = threading.Condition()
+        self._enqueued = 0
+        self._applied = 0
+        self._batches = 0
+        self._in_flight_since: float | None = None # enqueue time of the oldest key in the batch being applied
+        self._max_lag = 0.0
+        self._worker = threading.Thread(target=self._run, name="search-indexer", daemon=True)
+        self._worker.start()
+
+    def enqueue(self, key: Hashable):
+        ''' Schedules a document for reindexing, blocks while max_pending keys are waiting '''
+        with self._progress:
+            self._enqueued += 1
+        self._queue.put((monotonic(), key))
+
+    def _run(self):
+        ''' Worker loop, applies one batch per iteration until close() - INTERNAL USE ONLY '''
+        stopping = False
+        while not stopping:
+            batch = []
+            entry = self._queue.get()
+            while True:
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._apply(batch)
+
+    def _apply(self, batch: list[tuple[float, Hashable]]):
+        ''' Applies one batch and records progress - INTERNAL USE ONLY '''
+        self._in_flight_since = batch[0][0]
+        # Keys are applied from the document's current state, so one application covers all of its writes
+        keys = list(dict.fromkeys(key for _, key in batch))
+        try:
+            apply_batch = self._apply_batch()
+            if apply_batch is not None:
+                with self.lock:
+                    apply_batch(keys)
+            del apply_batch # do not keep the owner alive between batches
+        except Exception as e:
+            # Keep the worker alive, the failed documents are picked up again on their next write
+            logger.error(f"SearchIndexer batch error: {e}")
+        finally:
+            lag = monotonic() - batch[0][0]
+            with self._progress:
+                self._in_flight_since = None
+                self._applied += len(batch)
+                self._batches += 1
+                self._max_lag = max(self._max_lag, lag)
+                self._progress.notify_all()
+
+    def close(self, timeout: float | None = None):
+        ''' Applies the changes already enqueued, then stops the worker. No changes may be enqueued after this. '''
+        if not self._worker.is_alive():
+            return
+        self._queue.put(_STOP)
+        if threading.current_thread() is not self._worker:
+            self._worker.join(timeout)
+
+    def lag(self) -> float:
+        ''' Seconds the oldest unapplied change has been waiting, 0.0 when the indexes are current '''
+        with self._queue.mutex:
+            oldest = self._queue.queue[0][0] if self._queue.queue else None
+        in_flight_since = self._in_flight_since
+        if in_flight_since is not None:
+            oldest = in_flight_since
+        return monotonic() - oldest if oldest is not None else 0.0
+
+    def flush(self, timeout: float | None = None) -> bool:
+        ''' Waits until every change enqueued so far is applied, returns False on timeout '''
+        with self._progress:
+            target = self._enqueued
+            return self._progress.wait_for(lambda: self._applied >= target, timeout)
+
+    def stats(self) -> dict:
+        ''' Returns queue depth, lag and throughput counters '''
+        with self._progress:
+            return {
+                "pending": self._enqueued - self._applied,
+                "applied": self._applied,
+                "batches": self._batches,
+                "lag_seconds": self.lag(),
+                "max_lag_seconds": self._max_lag,
+                "max_pending": self._queue.maxsize
+            }
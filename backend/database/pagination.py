@@ -0,0 +1,46 @@
+'''
+Opaque cursors for keyset (seek) pagination
+'''
+
+import base64
+import json
+
+def _encode(values: list) -> str:
+    ''' Packs a JSON list into a url-safe cursor - INTERNAL USE ONLY '''
+    payload = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def _decode(cursor: str) -> list:
+    ''' Unpacks a cursor made by _encode, raises ValueError if it is malformed - INTERNAL USE ONLY '''
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return values
+
+def encode_cursor(timestamp: str, item_id: int) -> str:
+    ''' Encodes the (timestamp, id) of the last item on a page as an opaque cursor '''
+    return _encode([timestamp, item_id])
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    ''' Decodes a cursor made by encode_cursor, raises ValueError if it is malformed '''
+    values = _decode(cursor)
+    if len(values) != 2 or not isinstance(values[0], str) or not isinstance(values[1], int):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return values[0], values[1]
+
+def encode_score_cursor(as_of: float, score: float, doc_type: str, doc_id: int) -> str:
+    ''' Encodes the (score, type, id) of the last result on a ranked page as an opaque cursor.
+        as_of is the time the scores were computed at, so later pages rank with the same clock.
+    '''
+    return _encode([as_of, score, doc_type, doc_id])
+
+def decode_score_cursor(cursor: str) -> tuple[float, float, str, int]:
+    ''' Decodes a cursor made by encode_score_cursor, raises ValueError if it is malformed '''
+    values = _decode(cursor)
+    if (len(values) != 4 or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values[:2])
+            or not isinstance(values[2], str) or not isinstance(values[3], int)):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return float(values[0]), float(values[1]), values[2], values[3]
@@ -4,9 +4,22 @@ PostgreSQL database implementation
 
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Extract, Greatest, Power
+from time import time
 from api.models import Post
 
 from .database import Database
+from .pagination import decode_cursor, decode_score_cursor, encode_cursor, encode_score_cursor
+from .ranking import SEARCH_RECENCY_BOOST, SEARCH_RECENCY_HALF_LIFE, SEARCH_TYPE_ORDER
+
+# Same expression as the user_search_idx GIN index, so the planner can match it
+USER_SEARCH_VECTOR_SQL = (
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(username, '') || ' ' || coalesce(first_name, '') || ' ' || coalesce(last_name, ''))"
+)
 
 class PostgreSQLDatabase(Database):
     ''' PostgreSQL database implementation
@@ -99,7 +112,8 @@ class PostgreSQLDatabase(Database):
     def get_organization_children(self, org_id: int) -> dict:
         pass
 
-    def get_organization_posts(self, org_id: int) -> dict:
+    def get_organization_posts(self, org_id: int, include_descendants: bool = False,
+                               limit: int = 10, cursor: str | None = None) -> dict:
         pass
 
     def get_organization_admins(self, org_id: int) -> dict:
@@ -172,6 +186,10 @@ class PostgreSQLDatabase(Database):
     def get_event(self, event_id: int) -> dict:
         pass
 
+    def get_upcoming_events(self, start_time: str | None = None, end_time: str | None = None,
+                            org_id: int | None = None, limit: int = 50) -> dict:
+        pass
+
     # Events Going/Interested
     def going_event(self, event_id: int, user_id: int) -> dict:
         pass
@@ -185,6 +203,9 @@ class PostgreSQLDatabase(Database):
     def remove_interested_event(self, event_id: int, user_id: int) -> dict:
         pass
 
+    def get_event_attendees(self, event_id: int, status: str = "going", offset: int = 0, limit: int = 50) -> dict:
+        pass
+
     # Post/Event Comments
     def create_comment(self, post_id: int, parent_id: int, author_id: int, content: str) -> dict:
         pass
@@ -221,14 +242,47 @@ class PostgreSQLDatabase(Database):
     def get_replies(self, user_id: int, comment_id: int, offset: int = 0, limit: int = 10) -> dict:
         pass
 
-    def get_user_feed(self, user_id: int, offset: int = 0, limit: int = 10) -> dict:
-        pass
+    def get_user_feed(self, user_id: int, offset: int = 0, limit: int = 10,
+                      cursor: str | None = None, rank: str = "recent") -> dict:
+        if rank not in ("recent", "top"):
+            return {
+                "success": False,
+                "message": "Invalid rank, expected 'recent' or 'top'"
+            }
+        # Follows have no table in the PostgreSQL schema yet, so the feed only holds the user's own posts.
+        # Posts have no likes or comments either, so 'top' is ordered by recency too
+        posts = Post.objects.filter(author_id=user_id).order_by('-created_at', '-id')
+        if cursor is not None:
+            try:
+                timestamp, post_id = decode_cursor(cursor)
+            except ValueError:
+                return {
+                    "success": False,
+                    "message": "Invalid cursor"
+                }
+            # Seek past the last item of the previous page on the (created_at, id) index
+            posts = posts.filter(Q(created_at__lt=timestamp) | Q(created_at=timestamp, id__lt=post_id))
+        page = list(posts[offset:offset + limit])
+        feed = [{
+            "id": post.id,
+            "author_id": post.author_id,
+            "caption": post.content,
+            "timestamp": post.created_at.isoformat(),
+            "type": "post"
+        } for post in page]
+        return {
+            "success": True,
+            "message": "User feed retrieved successfully",
+            "data": feed,
+            "next_cursor": encode_cursor(feed[-1]['timestamp'], feed[-1]['id']) if feed and len(feed) == limit else None
+        }
 
         # Messaging
     def get_chats(self, user_id: int) -> dict:
         pass
 
-    def get_chat_messages(self, chat_id: int, offset: int = 0, limit: int = 10) -> dict:
+    def get_chat_messages(self, chat_id: int, offset: int = 0, limit: int = 10,
+                          before_id: int | None = None, after_id: int | None = None) -> dict:
         pass
 
     def create_chat(self, members: dict) -> dict:
@@ -259,13 +313,101 @@ class PostgreSQLDatabase(Database):
         pass
 
     # Search
+    def _search_users(self, query: str):
+        ''' Users whose username or names match the query, scored by ts_rank - INTERNAL USE ONLY '''
+        # Names are not stemmed, so the 'simple' configuration is used on both sides
+        search_query = SearchQuery(query, config='simple', search_type='websearch')
+        vector = RawSQL(USER_SEARCH_VECTOR_SQL, [], output_field=SearchVectorField())
+        return (User.objects.annotate(search_vector=vector)
+                .filter(search_vector=search_query)
+                .annotate(score=Cast(SearchRank(F('search_vector'), search_query), FloatField())))
+
+    def _search_posts(self, query: str, as_of: float):
+        ''' Posts whose content matches the query, scored by ts_rank boosted by recency as of as_of - INTERNAL USE ONLY '''
+        search_query = SearchQuery(query, config='english', search_type='websearch')
+        age = Greatest(Value(as_of) - Extract('created_at', 'epoch'), Value(0.0))
+        recency = 1.0 + SEARCH_RECENCY_BOOST * Power(0.5, age / SEARCH_RECENCY_HALF_LIFE)
+        rank = Cast(SearchRank(F('search_vector'), search_query), FloatField())
+        return (Post.objects.filter(search_vector=search_query).defer('search_vector')
+                .annotate(score=ExpressionWrapper(rank * recency, output_field=FloatField())))
+
     def search(self, query: str, include_posts: bool, include_events: bool,
-               include_organizations: bool, include_users: bool) -> dict:
-        pass
+               include_organizations: bool, include_users: bool,
+               limit: int = 20, cursor: str | None = None) -> dict:
+        as_of = time()
+        after = None
+        if cursor is not None:
+            try:
+                as_of, score, doc_type, doc_id = decode_score_cursor(cursor)
+                after = (score, SEARCH_TYPE_ORDER[doc_type], doc_id)
+            except (ValueError, KeyError):
+                return {
+                    "success": False,
+                    "message": "Invalid cursor"
+                }
+        # Organizations and events have no tables in the PostgreSQL schema yet, so only users and posts are searched
+        searches = []
+        if include_users:
+            searches.append(('user', self._search_users(query)))
+        if include_posts:
+            searches.append(('post', self._search_posts(query, as_of)))
+
+        counts = {}
+        candidates = []
+        for doc_type, matches in searches:
+            counts[doc_type] = matches.count()
+            if after is not None:
+                # Scores are double precision, so the cursor's float compares exactly against them
+                score, type_order, doc_id = after
+                # Seek past the cursor in (score desc, type, id) order
+                if SEARCH_TYPE_ORDER[doc_type] < type_order:
+                    matches = matches.filter(score__lt=score)
+                elif SEARCH_TYPE_ORDER[doc_type] == type_order:
+                    matches = matches.filter(Q(score__lt=score) | Q(score=score, id__gt=doc_id))
+                else:
+                    matches = matches.filter(score__lte=score)
+            # Each table contributes at most a page, one more to know whether another page follows
+            candidates.extend((doc_type, row) for row in matches.order_by('-score', 'id')[:limit + 1])
+        candidates.sort(key=lambda candidate: (-candidate[1].score, SEARCH_TYPE_ORDER[candidate[0]], candidate[1].id))
+        page = candidates[:limit]
+
+        results = []
+        for doc_type, row in page:
+            if doc_type == 'user':
+                results.append({
+                    "id": row.id,
+                    "username": row.username,
+                    "first_name": row.first_name,
+                    "last_name": row.last_name,
+                    "type": "user",
+                    "score": row.score
+                })
+            else:
+                results.append({
+                    "id": row.id,
+                    "author_id": row.author_id,
+                    "caption": row.content,
+                    "timestamp": row.created_at.isoformat(),
+                    "type": "post",
+                    "score": row.score
+                })
+        last = page[-1] if page and len(candidates) > limit else None
+        return {
+            "success": True,
+            "message": "Search completed",
+            "data": results,
+            "counts": counts,
+            "next_cursor": encode_score_cursor(as_of, last[1].score, last[0], last[1].id) if last else None
+        }
 
     def search_organizations(self, query: str) -> dict:
         pass
 
+    def typeahead_organizations(self, query: str, limit: int = 10) -> dict:
+        # Organizations have no table in the PostgreSQL schema yet. Once they do, index the name with
+        # pg_trgm (CREATE INDEX ... USING GIN (lower(name) gin_trgm_ops)) and filter with ILIKE 'query%'.
+        pass
+
     def search_events(self, query: str) -> dict:
         pass
 
@@ -0,0 +1,94 @@
+'''
+Engagement ranking of feed candidates, and the weights shared by search backends
+'''
+
+from datetime import datetime
+from itertools import repeat
+
+import numpy as np
+
+# Engagement is summed from the weighted terms below, then divided by (age in hours + 2) ** gravity
+DEFAULT_RANK_WEIGHTS = {
+    "approval": 1.0,    # smoothed like / (like + dislike) ratio
+    "likes": 1.0,       # log(1 + likes)
+    "comments": 0.5,    # log(1 + comments)
+    "going": 1.0,       # log(1 + going), events only
+    "interested": 0.5,  # log(1 + interested), events only
+    "gravity": 1.5      # how quickly older items sink
+}
+
+# Search results are ordered by score, ties by type in this order then by id
+SEARCH_TYPE_ORDER = {'user': 0, 'organization': 1, 'event': 2, 'post': 3}
+SEARCH_NAME_BOOST = 3.0 # a match in a name, username or title outweighs one in a bio, description or caption
+SEARCH_RECENCY_BOOST = 1.0 # a brand new post or event scores up to (1 + this) times its text relevance
+SEARCH_RECENCY_HALF_LIFE = 30 * 24 * 3600.0 # seconds
+
+def timestamp_to_epoch(timestamp: str | None) -> float:
+    ''' Converts an ISO 8601 timestamp to seconds since the epoch, 0.0 if it is missing or malformed '''
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+def score_feed(now: float, epochs: np.ndarray, likes: np.ndarray, dislikes: np.ndarray,
+               comments: np.ndarray, going: np.ndarray, interested: np.ndarray,
+               weights: dict[str, float]) -> np.ndarray:
+    ''' Scores every candidate at once from per-candidate arrays, higher is better '''
+    ages_hours = np.maximum(now - epochs, 0.0) / 3600.0
+    engagement = (weights["approval"] * (likes + 1.0) / (likes + dislikes + 2.0)
+                  + weights["likes"] * np.log1p(likes)
+                  + weights["comments"] * np.log1p(comments)
+                  + weights["going"] * np.log1p(going)
+                  + weights["interested"] * np.log1p(interested))
+    return engagement / np.power(ages_hours + 2.0, weights["gravity"])
+
+class FeedSignals:
+    ''' Ranking inputs of every published feed item, kept as rows of a numpy table.
+
+        Writes refresh one item's row, so ranking a window of candidates is a single
+        id-to-row lookup per candidate followed by vectorized gathers. Row 0 is never
+        assigned and stays zero, it stands in for ids that are not in the table.
+    '''
+    COLUMNS = ('epoch', 'likes', 'dislikes', 'comments', 'going', 'interested') # in score_feed argument order
+
+    def __init__(self, capacity: int = 1024):
+        self._rows: dict[int, int] = {} # item id -> row
+        self._free: list[int] = []
+        self._next_row = 1
+        self._table = np.zeros((max(capacity, 2), len(self.COLUMNS)), dtype=np.float64)
+
+    def add(self, item_id: int, epoch: float):
+        ''' Adds an item with no engagement yet, or resets it if it is already in the table '''
+        row = self._rows.get(item_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = self._next_row
+                self._next_row += 1
+                if row == len(self._table):
+                    self._table = np.concatenate([self._table, np.zeros_like(self._table)])
+            self._rows[item_id] = row
+        self._table[row] = 0.0
+        self._table[row, 0] = epoch
+
+    def update(self, item_id: int, likes: int, dislikes: int, comments: int, going: int, interested: int):
+        ''' Replaces an item's engagement counts, does nothing if the item is not in the table '''
+        row = self._rows.get(item_id)
+        if row is not None:
+            self._table[row, 1:] = (likes, dislikes, comments, going, interested)
+
+    def discard(self, item_id: int):
+        ''' Removes an item, its row is reused by a later add '''
+        row = self._rows.pop(item_id, None)
+        if row is not None:
+            self._table[row] = 0.0
+            self._free.append(row)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._rows
+
+    def gather(self, item_ids: list[int]) -> np.ndarray:
+        ''' Returns one column per entry of COLUMNS, one value per item id, zeros for unknown ids '''
+        rows = np.fromiter(map(self._rows.get, item_ids, repeat(0, len(item_ids))), dtype=np.intp, count=len(item_ids))
+        return self._table[rows].T
@@ -0,0 +1,176 @@
+'''
+Text indexes for DummyDatabase search
+'''
+
+from bisect import bisect_left, insort
+from math import log, log1p
+import re
+import unicodedata
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str | None) -> list[str]:
+    ''' Splits text into lowercase word tokens '''
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+def normalize_name(text: str | None) -> list[str]:
+    ''' Tokenizes a name with accents folded, so "Église" is typed as "eglise" '''
+    if not text:
+        return []
+    decomposed = unicodedata.normalize('NFKD', text)
+    return tokenize(''.join(char for char in decomposed if not unicodedata.combining(char)))
+
+class InvertedIndex:
+    ''' Maps each token to the documents containing it, with the token's weight in each.
+
+        Documents are keyed by (doc_type, doc_id) because users and organizations,
+        and posts and events, share id sequences.
+    '''
+    def __init__(self):
+        self._postings: dict[str, dict[tuple[str, int], float]] = {} # token -> {document key: weight}
+        self._doc_tokens: dict[tuple[str, int], list[str]] = {} # document key -> its distinct tokens
+        self._vocabulary: list[str] = [] # sorted distinct tokens, for prefix lookups
+
+    def add(self, doc_type: str, doc_id: int, *fields: tuple[str | None, float]):
+        ''' Indexes a document's (text, boost) fields, replacing any previous version of it.
+            A token's weight is its occurrence count in each field times that field's boost.
+        '''
+        key = (doc_type, doc_id)
+        self.remove(doc_type, doc_id)
+        weights = {}
+        for text, boost in fields:
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + boost
+        self._doc_tokens[key] = list(weights)
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+            postings[key] = weight
+
+    def remove(self, doc_type: str, doc_id: int):
+        ''' Drops a document from the index, if it is indexed '''
+        key = (doc_type, doc_id)
+        for token in self._doc_tokens.pop(key, ()):
+            postings = self._postings[token]
+            del postings[key]
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def _idf(self, postings: dict) -> float:
+        ''' Inverse document frequency, rare tokens say more about a document than common ones '''
+        return log(1 + len(self._doc_tokens) / len(postings))
+
+    def _prefix_scores(self, prefix: str) -> dict[tuple[str, int], float]:
+        ''' Returns the best score of a token starting with prefix in each document containing one '''
+        scores = {}
+        index = bisect_left(self._vocabulary, prefix)
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(prefix):
+            postings = self._postings[self._vocabulary[index]]
+            idf = self._idf(postings)
+            for key, weight in postings.items():
+                score = idf * log1p(weight)
+                if score > scores.get(key, 0.0):
+                    scores[key] = score
+            index += 1
+        return scores
+
+    def search(self, query: str, doc_types=None) -> dict[tuple[str, int], float]:
+        ''' Returns the keys of the documents containing every query token, with their tf-idf relevance.
+            The last token also matches as a prefix, so partially typed words find results.
+        '''
+        tokens = tokenize(query)
+        if not tokens:
+            return {}
+        # (postings, idf) per term, the prefix term's postings already hold final scores
+        terms = []
+        for token in set(tokens[:-1]):
+            postings = self._postings.get(token)
+            if not postings:
+                return {}
+            terms.append((postings, self._idf(postings)))
+        terms.append((self._prefix_scores(tokens[-1]), None))
+        # Walk the rarest term's documents and probe the others, so the work is bounded by the smallest postings
+        terms.sort(key=lambda term: len(term[0]))
+        matches = {}
+        for key in terms[0][0]:
+            if doc_types is not None and key[0] not in doc_types:
+                continue
+            score = 0.0
+            for postings, idf in terms:
+                weight = postings.get(key)
+                if weight is None:
+                    break
+                score += weight if idf is None else idf * log1p(weight)
+            else:
+                matches[key] = score
+        return matches
+
+
+class PrefixIndex:
+    ''' Sorted index of normalized names for typeahead lookups.
+
+        Every name is stored once whole and once from the start of each later word, so
+        "grace community church" is found by "gra", "comm" and "church". A lookup is a
+        binary search followed by a walk over the matching range, O(log n + k).
+    '''
+    def __init__(self, names=()):
+        self._names: list[tuple[str, int]] = [] # (whole normalized name, doc id)
+        self._suffixes: list[tuple[str, int]] = [] # (name from a later word onwards, doc id)
+        self._doc_keys: dict[int, list[str]] = {} # doc id -> its keys, whole name first
+        for doc_id, name in names:
+            keys = self._keys(name)
+            if keys:
+                self._doc_keys[doc_id] = keys
+                self._names.append((keys[0], doc_id))
+                self._suffixes.extend((key, doc_id) for key in keys[1:])
+        self._names.sort()
+        self._suffixes.sort()
+
+    @staticmethod
+    def _keys(name: str | None) -> list[str]:
+        tokens = normalize_name(name)
+        return [' '.join(tokens[start:]) for start in range(len(tokens))]
+
+    def add(self, doc_id: int, name: str | None):
+        ''' Indexes a name, replacing any previous name of the document '''
+        self.remove(doc_id)
+        keys = self._keys(name)
+        if not keys:
+            return
+        self._doc_keys[doc_id] = keys
+        insort(self._names, (keys[0], doc_id))
+        for key in keys[1:]:
+            insort(self._suffixes, (key, doc_id))
+
+    def remove(self, doc_id: int):
+        ''' Drops a document from the index, if it is indexed '''
+        keys = self._doc_keys.pop(doc_id, None)
+        if keys is None:
+            return
+        del self._names[bisect_left(self._names, (keys[0], doc_id))]
+        for key in keys[1:]:
+            del self._suffixes[bisect_left(self._suffixes, (key, doc_id))]
+
+    def search(self, query: str, limit: int | None = None) -> list[int]:
+        ''' Returns the ids of documents with a word starting with the query, at most limit of them.
+            Names that start with the query come first, each group in alphabetical order.
+        '''
+        prefix = ' '.join(normalize_name(query))
+        if not prefix:
+            return []
+        results = []
+        seen = set()
+        for entries in (self._names, self._suffixes):
+            index = bisect_left(entries, (prefix,))
+            while index < len(entries) and entries[index][0].startswith(prefix):
+                doc_id = entries[index][1]
+                if doc_id not in seen:
+                    if limit is not None and len(results) >= limit:
+                        return results
+                    seen.add(doc_id)
+                    results.append(doc_id)
+                index += 1
+        return results
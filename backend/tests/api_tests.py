@@ -3,6 +3,11 @@ import requests
 
 BASE_URL = "http://127.0.0.1:8000/api/"
 
+def flush_search_index():
+    ''' Waits until earlier writes are searchable, search indexes are updated in the background '''
+    r = requests.post(BASE_URL + "search/flush/")
+    assert r.json().get("success"), r.text
+
 class APITestCase(unittest.TestCase):
     def setUp(self):
         # Create a user and organization for use in tests
@@ -194,6 +199,118 @@ class APITestCase(unittest.TestCase):
         r = requests.delete(BASE_URL + f"events/{event_id}/delete/")
         self.assertTrue(r.json().get("success"))
 
+    def test_upcoming_events(self):
+        # Child organization, so filtering by the parent covers its subtree
+        r = requests.post(BASE_URL + "organizations/", json={"name": "TestChildOrg", "parent_id": self.org_id})
+        self.assertTrue(r.json().get("success"))
+        child_id = r.json()["data"]["id"]
+
+        event_ids = {}
+        for name, author_id, start_time, end_time in [
+            ("child_morning", child_id, "2030-01-01T10:00:00Z", "2030-01-01T12:00:00Z"),
+            ("user_afternoon", self.user_id, "2030-01-01T13:00:00Z", "2030-01-01T14:00:00Z"),
+            ("child_later", child_id, "2030-01-03T10:00:00Z", "2030-01-03T12:00:00Z"),
+        ]:
+            r = requests.post(BASE_URL + "events/", json={
+                "author_id": author_id,
+                "title": name,
+                "description": "Upcoming Desc",
+                "start_time": start_time,
+                "end_time": end_time,
+                "location": "Event Location"
+            })
+            self.assertTrue(r.json().get("success"))
+            event_ids[name] = r.json().get("id")
+
+        def upcoming(**params):
+            r = requests.get(BASE_URL + "events/upcoming/", params=params)
+            self.assertTrue(r.json().get("success"))
+            return {event["id"] for event in r.json()["data"]}
+
+        # Range over the first day
+        ids = upcoming(start="2030-01-01T00:00:00Z", end="2030-01-02T00:00:00Z")
+        self.assertIn(event_ids["child_morning"], ids)
+        self.assertIn(event_ids["user_afternoon"], ids)
+        self.assertNotIn(event_ids["child_later"], ids)
+
+        # Boundaries are inclusive, an event ending at the start or starting at the end overlaps the range
+        ids = upcoming(start="2030-01-01T12:00:00Z", end="2030-01-01T13:00:00Z")
+        self.assertIn(event_ids["child_morning"], ids)
+        self.assertIn(event_ids["user_afternoon"], ids)
+        ids = upcoming(start="2030-01-01T12:00:01Z", end="2030-01-01T12:59:59Z")
+        self.assertNotIn(event_ids["child_morning"], ids)
+        self.assertNotIn(event_ids["user_afternoon"], ids)
+
+        # Organization subtree
+        ids = upcoming(start="2030-01-01T00:00:00Z", end="2030-01-04T00:00:00Z", org_id=self.org_id)
+        self.assertIn(event_ids["child_morning"], ids)
+        self.assertIn(event_ids["child_later"], ids)
+        self.assertNotIn(event_ids["user_afternoon"], ids)
+
+        # End before start
+        r = requests.get(BASE_URL + "events/upcoming/", params={"start": "2030-01-02T00:00:00Z",
+                                                               "end": "2030-01-01T00:00:00Z"})
+        self.assertFalse(r.json().get("success"))
+        self.assertEqual(r.json().get("message"), "Invalid time range")
+
+        for event_id in event_ids.values():
+            requests.delete(BASE_URL + f"events/{event_id}/delete/")
+        requests.delete(BASE_URL + f"organizations/{child_id}/")
+
+    def test_event_attendees(self):
+        r = requests.post(BASE_URL + "events/", json={
+            "author_id": self.user_id,
+            "title": "Attendees Event",
+            "description": "Event Desc",
+            "start_time": "2025-01-01T10:00:00Z",
+            "end_time": "2025-01-01T12:00:00Z",
+            "location": "Event Location"
+        })
+        self.assertTrue(r.json().get("success"))
+        event_id = r.json().get("id")
+
+        # Two more users, one going and one interested
+        other_ids = []
+        for username in ["attendeeuser1", "attendeeuser2"]:
+            r = requests.post(BASE_URL + "users/", json={"username": username, "password": self.password})
+            self.assertTrue(r.json().get("success"))
+            other_ids.append(r.json().get("id"))
+        going_ids = sorted([self.user_id, other_ids[0]])
+        for user_id in going_ids:
+            r = requests.post(BASE_URL + f"events/{event_id}/going/{user_id}/")
+            self.assertTrue(r.json().get("success"))
+        r = requests.post(BASE_URL + f"events/{event_id}/interested/{other_ids[1]}/")
+        self.assertTrue(r.json().get("success"))
+
+        # Going is the default status
+        r = requests.get(BASE_URL + f"events/{event_id}/attendees/")
+        self.assertTrue(r.json().get("success"))
+        self.assertEqual(r.json()["count"], 2)
+        self.assertEqual([attendee["user_id"] for attendee in r.json()["data"]], going_ids)
+
+        r = requests.get(BASE_URL + f"events/{event_id}/attendees/", params={"status": "interested"})
+        self.assertTrue(r.json().get("success"))
+        self.assertEqual(r.json()["count"], 1)
+        self.assertEqual([attendee["user_id"] for attendee in r.json()["data"]], [other_ids[1]])
+        self.assertEqual(r.json()["data"][0]["username"], "attendeeuser2")
+
+        # Paging, count is the total regardless of the page
+        pages = []
+        for offset in range(3):
+            r = requests.get(BASE_URL + f"events/{event_id}/attendees/", params={"offset": offset, "limit": 1})
+            self.assertTrue(r.json().get("success"))
+            self.assertEqual(r.json()["count"], 2)
+            pages.append([attendee["user_id"] for attendee in r.json()["data"]])
+        self.assertEqual(pages, [[going_ids[0]], [going_ids[1]], []])
+
+        r = requests.get(BASE_URL + f"events/{event_id}/attendees/", params={"status": "maybe"})
+        self.assertFalse(r.json().get("success"))
+        self.assertEqual(r.json().get("message"), "Invalid status, expected 'going' or 'interested'")
+
+        requests.delete(BASE_URL + f"events/{event_id}/delete/")
+        for user_id in other_ids:
+            requests.delete(BASE_URL + f"users/{user_id}/")
+
     def test_comments(self):
         # Create post for comment
         r = requests.post(BASE_URL + "posts/", json={
@@ -228,6 +345,160 @@ class APITestCase(unittest.TestCase):
         # Delete post
         requests.delete(BASE_URL + f"posts/{post_id}/delete/")
 
+    def test_organization_posts_with_descendants(self):
+        r = requests.post(BASE_URL + "organizations/", json={"name": "TestChildOrg", "parent_id": self.org_id})
+        self.assertTrue(r.json().get("success"))
+        child_id = r.json()["data"]["id"]
+
+        # Alternate authors so the newest-first merge has to interleave the two organizations
+        post_ids = []
+        for i, author_id in enumerate([self.org_id, child_id, self.org_id, child_id, self.org_id]):
+            r = requests.post(BASE_URL + "posts/", json={
+                "author_id": author_id,
+                "caption": f"Subtree post {i}",
+                "image_url": "http://example.com/image.jpg",
+                "location": "Test Location"
+            })
+            self.assertTrue(r.json().get("success"))
+            post_ids.append(r.json().get("id"))
+
+        url = BASE_URL + f"organizations/{self.org_id}/posts/"
+        r = requests.get(url)
+        self.assertTrue(r.json().get("success"))
+        self.assertEqual({post["id"] for post in r.json()["data"]}, {post_ids[0], post_ids[2], post_ids[4]})
+
+        params = {"include_descendants": "true", "limit": 2}
+        data = requests.get(url, params=params).json()
+        seen = []
+        while True:
+            self.assertTrue(data.get("success"))
+            seen.extend(post["id"] for post in data["data"])
+            if data["next_cursor"] is None:
+                break
+            self.assertEqual(len(data["data"]), 2)
+            data = requests.get(url, params={**params, "cursor": data["next_cursor"]}).json()
+        self.assertEqual(seen, post_ids[::-1])
+
+        r = requests.get(url, params={**params, "cursor": "not-a-cursor"})
+        self.assertFalse(r.json().get("success"))
+
+        for post_id in post_ids:
+            requests.delete(BASE_URL + f"posts/{post_id}/delete/")
+        requests.delete(BASE_URL + f"organizations/{child_id}/")
+
+    def test_user_feed_pagination(self):
+        post_ids = []
+        for i in range(5):
+            r = requests.post(BASE_URL + "posts/", json={
+                "author_id": self.user_id,
+                "caption": f"Feed paging post {i}",
+                "image_url": "http://example.com/image.jpg",
+                "location": "Test Location"
+            })
+            self.assertTrue(r.json().get("success"))
+            post_ids.append(r.json().get("id"))
+
+        url = BASE_URL + f"users/{self.user_id}/feed/"
+        data = requests.get(url, params={"limit": 2}).json()
+        self.assertTrue(data.get("success"))
+        seen = [item["id"] for item in data["data"]]
+
+        # A post created between pages lands before the cursor, so later pages neither repeat nor skip items
+        r = requests.post(BASE_URL + "posts/", json={
+            "author_id": self.user_id,
+            "caption": "Feed paging post between pages",
+            "image_url": "http://example.com/image.jpg",
+            "location": "Test Location"
+        })
+        self.assertTrue(r.json().get("success"))
+        new_post_id = r.json().get("id")
+
+        while data["next_cursor"] is not None:
+            self.assertEqual(len(data["data"]), 2)
+            data = requests.get(url, params={"limit": 2, "cursor": data["next_cursor"]}).json()
+            self.assertTrue(data.get("success"))
+            seen.extend(item["id"] for item in data["data"])
+        self.assertEqual(seen, post_ids[::-1])
+
+        # A fresh first page starts with the new post
+        data = requests.get(url, params={"limit": 2}).json()
+        self.assertEqual(data["data"][0]["id"], new_post_id)
+
+        r = requests.get(url, params={"limit": 2, "cursor": "not-a-cursor"})
+        self.assertEqual(r.status_code, 401)
+        self.assertFalse(r.json().get("success"))
+
+        for post_id in [*post_ids, new_post_id]:
+            requests.delete(BASE_URL + f"posts/{post_id}/delete/")
+
+    def test_user_feed_top_rank(self):
+        post_ids = []
+        for i in range(3):
+            r = requests.post(BASE_URL + "posts/", json={
+                "author_id": self.user_id,
+                "caption": f"Ranked post {i}",
+                "image_url": "http://example.com/image.jpg",
+                "location": "Test Location"
+            })
+            self.assertTrue(r.json().get("success"))
+            post_ids.append(r.json().get("id"))
+
+        # Engagement lifts the oldest post above the newer ones
+        r = requests.post(BASE_URL + f"posts/{post_ids[0]}/like/{self.user_id}/")
+        self.assertTrue(r.json().get("success"))
+        url = BASE_URL + f"users/{self.user_id}/feed/"
+        data = requests.get(url, params={"rank": "top", "limit": 2}).json()
+        self.assertTrue(data.get("success"))
+        self.assertEqual([item["id"] for item in data["data"]], [post_ids[0], post_ids[2]])
+        self.assertIsNone(data["next_cursor"])
+
+        # Ranked pages are offset based
+        data = requests.get(url, params={"rank": "top", "limit": 2, "offset": 2}).json()
+        self.assertEqual([item["id"] for item in data["data"]], [post_ids[1]])
+
+        r = requests.get(url, params={"rank": "popular"})
+        self.assertEqual(r.status_code, 401)
+        self.assertFalse(r.json().get("success"))
+
+        for post_id in post_ids:
+            requests.delete(BASE_URL + f"posts/{post_id}/delete/")
+
+    def test_chat_message_keyset_paging(self):
+        r = requests.post(BASE_URL + "chats/create/", json={"members": [
+            {"user_id": self.user_id, "is_org": False, "role": "member"},
+            {"user_id": 1, "is_org": False, "role": "member"}
+        ]})
+        self.assertTrue(r.json().get("success"))
+        chat_id = r.json()["data"]["id"]
+
+        message_ids = []
+        for i in range(5):
+            r = requests.post(BASE_URL + f"chats/{chat_id}/messages/create/", json={
+                "sender_id": self.user_id,
+                "content": f"Paging message {i}"
+            })
+            self.assertTrue(r.json().get("success"))
+            message_ids.append(r.json()["data"]["id"])
+
+        url = BASE_URL + f"chats/{chat_id}/messages/"
+        def page(**params):
+            r = requests.get(url, params={"limit": 2, **params})
+            self.assertTrue(r.json().get("success"))
+            return [message["id"] for message in r.json()["data"]]
+
+        # after_id pages forward oldest first, before_id pages back from the newest
+        self.assertEqual(page(after_id=message_ids[1]), message_ids[2:4])
+        self.assertEqual(page(after_id=message_ids[4]), [])
+        self.assertEqual(page(before_id=message_ids[4]), message_ids[2:4])
+        self.assertEqual(page(before_id=message_ids[1]), message_ids[:1])
+
+        # Keys stay valid when a message is deleted, where offsets would shift
+        r = requests.delete(BASE_URL + f"chats/{chat_id}/messages/{message_ids[2]}/delete/")
+        self.assertTrue(r.json().get("success"))
+        self.assertEqual(page(after_id=message_ids[1]), message_ids[3:5])
+        self.assertEqual(page(before_id=message_ids[3]), message_ids[:2])
+        self.assertEqual(page(before_id=message_ids[2]), message_ids[:2])
+
     def test_search(self):
         r = requests.get(BASE_URL + "search/", params={"query": self.username})
         self.assertTrue(r.json().get("success"))
@@ -238,5 +509,74 @@ class APITestCase(unittest.TestCase):
         r = requests.get(BASE_URL + "search/events/", params={"query": "Event"})
         self.assertTrue(r.json().get("success"))
 
+    def test_search_pagination(self):
+        post_ids = set()
+        for i in range(5):
+            r = requests.post(BASE_URL + "posts/", json={
+                "author_id": self.user_id,
+                "caption": f"Quokka paging post {i}",
+                "image_url": "http://example.com/image.jpg",
+                "location": "Test Location"
+            })
+            self.assertTrue(r.json().get("success"))
+            post_ids.add(r.json().get("id"))
+
+        params = {"query": "quokka", "limit": 2}
+        flush_search_index()
+        data = requests.get(BASE_URL + "search/", params=params).json()
+        self.assertTrue(data.get("success"))
+        self.assertEqual(data["counts"], {"user": 0, "organization": 0, "event": 0, "post": 5})
+
+        # Follow next_cursor to the end, pages are full until the last one
+        seen = []
+        while True:
+            self.assertLessEqual(len(data["data"]), 2)
+            seen.extend(result["id"] for result in data["data"])
+            scores = [result["score"] for result in data["data"]]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            if data["next_cursor"] is None:
+                break
+            self.assertEqual(len(data["data"]), 2)
+            data = requests.get(BASE_URL + "search/", params={**params, "cursor": data["next_cursor"]}).json()
+            self.assertTrue(data.get("success"))
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), post_ids)
+
+        r = requests.get(BASE_URL + "search/", params={**params, "cursor": "not-a-cursor"})
+        self.assertFalse(r.json().get("success"))
+
+        for post_id in post_ids:
+            requests.delete(BASE_URL + f"posts/{post_id}/delete/")
+
+    def test_organization_typeahead(self):
+        url = BASE_URL + "search/organizations/typeahead/"
+        org_ids = []
+        for name, parent_id in [("Zephyr Harbor Church", 0), ("Zephyr Lake", 0), ("Zephyr Child", self.org_id)]:
+            r = requests.post(BASE_URL + "organizations/", json={"name": name, "parent_id": parent_id})
+            self.assertTrue(r.json().get("success"))
+            org_ids.append(r.json()["data"]["id"])
+        harbor_id, lake_id, child_id = org_ids
+
+        # Top-level organizations only, names starting with the query first
+        flush_search_index()
+        data = requests.get(url, params={"query": "zephyr"}).json()
+        self.assertTrue(data.get("success"))
+        self.assertEqual([org["id"] for org in data["data"]], [harbor_id, lake_id])
+        self.assertNotIn(child_id, [org["id"] for org in data["data"]])
+
+        # A later word of the name matches by prefix
+        data = requests.get(url, params={"query": "harb"}).json()
+        self.assertEqual([org["id"] for org in data["data"]], [harbor_id])
+        self.assertEqual(set(data["data"][0]), {"id", "name", "location", "pfp_url"})
+
+        data = requests.get(url, params={"query": "zephyr", "limit": 1}).json()
+        self.assertEqual([org["id"] for org in data["data"]], [harbor_id])
+
+        r = requests.get(url)
+        self.assertEqual(r.status_code, 400)
+
+        for org_id in org_ids:
+            requests.delete(BASE_URL + f"organizations/{org_id}/")
+
 if __name__ == "__main__":
     unittest.main()
@@ -332,9 +332,24 @@ export async function getOrganizationChildren(orgId, baseUrl = "") {
   }
 }
 
-export async function getOrganizationPosts(orgId, baseUrl = "") {
+/**
+ * Gets an organization's posts.
+ * @async
+ * @function getOrganizationPosts
+ * @param {number} orgId - The organization ID.
+ * @param {Object} [options={}] - { includeDescendants, limit, cursor }: with includeDescendants, returns a
+ *   newest-first page of posts across the organization and its child organizations, with a next_cursor.
+ * @param {string} baseUrl - The base URL for the API.
+ * @returns {Promise<Object>} Posts or error.
+ */
+export async function getOrganizationPosts(orgId, options = {}, baseUrl = "") {
   try {
-    const res = await fetch(`${baseUrl}/api/organizations/${orgId}/posts/`);
+    let url = `${baseUrl}/api/organizations/${orgId}/posts/`;
+    if (options.includeDescendants) {
+      url += `?include_descendants=true&limit=${options.limit ?? 10}`;
+      if (options.cursor) url += `&cursor=${encodeURIComponent(options.cursor)}`;
+    }
+    const res = await fetch(url);
     const data = await res.json();
     if (!res.ok) return { error: data.error || "Failed to get organization posts" };
     return data;
@@ -622,6 +637,31 @@ export async function getEvent(eventId, baseUrl = "") {
   }
 }
 
+/**
+ * Gets the events taking place in a time range, ordered by start time.
+ * @async
+ * @function getUpcomingEvents
+ * @param {Object} [options={}] - { start, end, orgId, limit }: ISO timestamps (default: now to 7 days from now),
+ *   an organization whose subtree to filter by, and the maximum number of events.
+ * @param {string} baseUrl - The base URL for the API.
+ * @returns {Promise<Object>} Events or error.
+ */
+export async function getUpcomingEvents(options = {}, baseUrl = "") {
+  try {
+    const params = new URLSearchParams();
+    if (options.start) params.set("start", options.start);
+    if (options.end) params.set("end", options.end);
+    if (options.orgId) params.set("org_id", options.orgId);
+    if (options.limit) params.set("limit", options.limit);
+    const res = await fetch(`${baseUrl}/api/events/upcoming/?${params}`);
+    const data = await res.json();
+    if (!res.ok) return { error: data.error || "Failed to get upcoming events" };
+    return data;
+  } catch (err) {
+    return { error: "Network error or server unavailable" };
+  }
+}
+
 // Events Going/Interested
 
 export async function goingEvent(eventId, userId, baseUrl = "") {
@@ -668,6 +708,28 @@ export async function removeInterestedEvent(eventId, userId, baseUrl = "") {
   }
 }
 
+/**
+ * Gets a page of the users going to or interested in an event.
+ * @async
+ * @function getEventAttendees
+ * @param {number} eventId - The event ID.
+ * @param {string} [status="going"] - "going" or "interested".
+ * @param {number} [offset=0] - Pagination offset.
+ * @param {number} [limit=50] - Pagination limit.
+ * @param {string} baseUrl - The base URL for the API.
+ * @returns {Promise<Object>} Attendees and total count, or error.
+ */
+export async function getEventAttendees(eventId, status = "going", offset = 0, limit = 50, baseUrl = "") {
+  try {
+    const res = await fetch(`${baseUrl}/api/events/${eventId}/attendees/?status=${status}&offset=${offset}&limit=${limit}`);
+    const data = await res.json();
+    if (!res.ok) return { error: data.error || "Failed to get event attendees" };
+    return data;
+  } catch (err) {
+    return { error: "Network error or server unavailable" };
+  }
+}
+
 // Post/Event Comments
 
 export async function createComment(postId, authorId, parentId, content, baseUrl = "") {
@@ -812,9 +874,22 @@ export async function getUserCommentReplies(userId, commentId, offset, limit, ba
   }
 }
 
-export async function getUserFeed(userId, offset = 0, limit = 10, baseUrl = "") {
+/**
+ * Gets a page of a user's home feed, newest first.
+ * @async
+ * @function getUserFeed
+ * @param {number} userId - The user ID.
+ * @param {number} [offset=0] - Number of items to skip after the cursor.
+ * @param {number} [limit=10] - Pagination limit.
+ * @param {string|null} [cursor=null] - The next_cursor of the previous page.
+ * @param {string} baseUrl - The base URL for the API.
+ * @returns {Promise<Object>} Feed items and next_cursor, or error.
+ */
+export async function getUserFeed(userId, offset = 0, limit = 10, cursor = null, baseUrl = "") {
   try {
-    const res = await fetch(`${baseUrl}/api/users/${userId}/feed/?offset=${offset}&limit=${limit}`);
+    let url = `${baseUrl}/api/users/${userId}/feed/?offset=${offset}&limit=${limit}`;
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+    const res = await fetch(url);
     const data = await res.json();
     if (!res.ok) return { error: data.error || "Failed to get user feed" };
     return data;
@@ -825,9 +900,26 @@ export async function getUserFeed(userId, offset = 0, limit = 10, baseUrl = "")
 
 // Search
 
-export async function search(userId, query, includePosts = true, includeEvents = true, includeOrganizations = true, includeUsers = true, baseUrl = "") {
+/**
+ * Searches users, organizations, events and posts, best matches first.
+ * @async
+ * @function search
+ * @param {number} userId - The user ID.
+ * @param {string} query - The search query.
+ * @param {boolean} [includePosts=true] - Whether to include posts.
+ * @param {boolean} [includeEvents=true] - Whether to include events.
+ * @param {boolean} [includeOrganizations=true] - Whether to include organizations.
+ * @param {boolean} [includeUsers=true] - Whether to include users.
+ * @param {number} [limit=20] - Maximum number of results on the page.
+ * @param {string|null} [cursor=null] - The next_cursor of the previous page.
+ * @param {string} baseUrl - The base URL for the API.
+ * @returns {Promise<Object>} A page of results with per-type counts and next_cursor, or error.
+ */
+export async function search(userId, query, includePosts = true, includeEvents = true, includeOrganizations = true, includeUsers = true, limit = 20, cursor = null, baseUrl = "") {
   try {
-    const res = await fetch(`${baseUrl}/api/search/?query=${encodeURIComponent(query)}&includePosts=${includePosts}&includeEvents=${includeEvents}&includeOrganizations=${includeOrganizations}&includeUsers=${includeUsers}`);
+    let url = `${baseUrl}/api/search/?query=${encodeURIComponent(query)}&includePosts=${includePosts}&includeEvents=${includeEvents}&includeOrganizations=${includeOrganizations}&includeUsers=${includeUsers}&limit=${limit}`;
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+    const res = await fetch(url);
     const data = await res.json();
     if (!res.ok) return { error: data.error || "Failed to search" };
     return data;
@@ -847,6 +939,26 @@ export async function searchOrganizations(query, baseUrl = "") {
   }
 }
 
+/**
+ * Suggests top-level organizations for a partially typed name.
+ * @async
+ * @function typeaheadOrganizations
+ * @param {string} query - The partially typed organization name.
+ * @param {number} [limit=10] - Maximum number of suggestions.
+ * @param {string} baseUrl - The base URL for the API.
+ * @returns {Promise<Object>} Suggested organizations or error.
+ */
+export async function typeaheadOrganizations(query, limit = 10, baseUrl = "") {
+  try {
+    const res = await fetch(`${baseUrl}/api/search/organizations/typeahead/?query=${encodeURIComponent(query)}&limit=${limit}`);
+    const data = await res.json();
+    if (!res.ok) return { error: data.error || "Failed to get organization suggestions" };
+    return data;
+  } catch (err) {
+    return { error: "Network error or server unavailable" };
+  }
+}
+
 /**
  * Searches for events based on the provided query.
  * @async
@@ -894,12 +1006,16 @@ export async function getChats(userId, baseUrl = "") {
  * @param {number} chatId - The ID of the chat.
  * @param {number} offset - The offset for pagination.
  * @param {number} limit - The limit for pagination.
+ * @param {Object} cursor - Optional message ID cursor: { beforeId } for older messages or { afterId } for newer ones.
  * @param {string} baseUrl - The base URL for the API.
  * @returns {Promise<Object>} Messages data or error.
  */
-export async function getChatMessages(chatId, offset = 0, limit = 10, baseUrl = "") {
+export async function getChatMessages(chatId, offset = 0, limit = 10, cursor = {}, baseUrl = "") {
   try {
-    const res = await fetch(`${baseUrl}/api/chats/${chatId}/messages/?offset=${offset}&limit=${limit}`);
+    let url = `${baseUrl}/api/chats/${chatId}/messages/?offset=${offset}&limit=${limit}`;
+    if (cursor.beforeId) url += `&before_id=${cursor.beforeId}`;
+    if (cursor.afterId) url += `&after_id=${cursor.afterId}`;
+    const res = await fetch(url);
     const data = await res.json();
     if (!res.ok) return { error: data.error || "Failed to get chat messages" };
     return data;
@@ -41,7 +41,7 @@ const tests = [
     { fn: api.updateOrganization, args: [1, "Updated Org"] },
     { fn: api.getOrganization, args: [1] },
     { fn: api.getOrganizationChildren, args: [1] },
-    { fn: api.getOrganizationPosts, args: [1] },
+    { fn: api.getOrganizationPosts, args: [1, {}] },
     { fn: api.getOrganizationAdmins, args: [1] },
     { fn: api.getOrganizationMembers, args: [1] },
     { fn: api.getOrganizationCongregants, args: [1] },
@@ -77,12 +77,12 @@ const tests = [
     { fn: api.removeDislike, args: [1, 1] },
     { fn: api.getUserPostComments, args: [1, 1, 0, 10] },
     { fn: api.getUserCommentReplies, args: [1, 1, 0, 10] },
-    { fn: api.getUserFeed, args: [1, 0, 10] },
-    { fn: api.search, args: [USER_ID, "test", true, true, true, true] },
+    { fn: api.getUserFeed, args: [1, 0, 10, null] },
+    { fn: api.search, args: [USER_ID, "test", true, true, true, true, 20, null] },
     
     // Messaging API Tests
     { fn: api.getChats, args: [USER_ID] },
-    { fn: api.getChatMessages, args: [1, 0, 10] },
+    { fn: api.getChatMessages, args: [1, 0, 10, {}] },
     { fn: api.createChat, args: [[{ user_id: 1, is_org: false, role: "member" }, { user_id: 2, is_org: false, role: "member" }]] },
     { fn: api.createGroupChat, args: [[{ user_id: 1, is_org: false, role: "member" }, { user_id: 2, is_org: false, role: "member" }], "Test Group", "http://example.com/group.jpg"] },
     { fn: api.addGroupChatMember, args: [1, { user_id: 3, is_org: false, role: "member" }] },
@@ -12,16 +12,24 @@ function ExplorePage({ userId, user }) {
   const [queryData, setqueryData] = useState("");
 
   const [results, setResults] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+
+  const fetchResults = async (cursor = null) => {
+    if (queryData === "") {
+      setResults([]);
+      setNextCursor(null);
+      return;
+    }
+    const response = await search(userId, queryData, posts, events, organizations, users, 20, cursor);
+    if (response.error) {
+      console.error("Failed to search:", response.error);
+      return;
+    }
+    setResults(prev => cursor ? [...prev, ...response.data] : response.data);
+    setNextCursor(response.next_cursor);
+  };
 
   useEffect(() => {
-    const fetchResults = async () => {
-      if (queryData === "") {
-        setResults([]);
-        return;
-      }
-      const results = await search(userId, queryData, posts, events, organizations, users);
-      setResults(results.data);
-    };
     fetchResults();
   }, [queryData, users, organizations, events, posts]);
 
@@ -38,6 +46,14 @@ function ExplorePage({ userId, user }) {
         posts={posts}
         setPosts={setPosts} />
       <ResultsList userId={userId} user={user} results={results} />
+      {nextCursor && (
+        <button
+          className="mt-4 w-full py-2 text-indigo-700 hover:underline"
+          onClick={() => fetchResults(nextCursor)}
+        >
+          Load more
+        </button>
+      )}
     </div>
   );
 }
@@ -7,12 +7,14 @@ import Event from "./Event";
 
 export default function ContentList({ userId, user }) {
     const [items, setItems] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
 
-    const fetchEvents = async () => {
+    const fetchEvents = async (cursor = null) => {
         try {
-            const response = await getUserFeed(userId, 0, 20);
+            const response = await getUserFeed(userId, 0, 20, cursor);
             if (response.success) {
-                setItems(response.data);
+                setItems(prev => cursor ? [...prev, ...response.data] : response.data);
+                setNextCursor(response.next_cursor);
             } else {
                 console.error("Failed to fetch events:", response.message);
             }
@@ -42,6 +44,15 @@ export default function ContentList({ userId, user }) {
                     )
                 ))
             )}
+
+            {nextCursor && (
+                <button
+                    className="mt-4 w-full py-2 text-indigo-700 hover:underline"
+                    onClick={() => fetchEvents(nextCursor)}
+                >
+                    Load more
+                </button>
+            )}
         </main>
     );
 }
@@ -38,7 +38,8 @@ function ChatFrame({ userId, chat, chatId }) {
         
         try {
             setLoading(true);
-            const res = await getChatMessages(parseInt(currentChatId), messages.length, 20);
+            const lastMessage = messages[messages.length - 1];
+            const res = await getChatMessages(parseInt(currentChatId), 0, 20, lastMessage ? { afterId: lastMessage.id } : {});
             console.log("RES", res);
             if (res.success) {
                 setMessages(prev => [...prev, ...(res.data || [])]);